@@ -1,97 +1,820 @@
 # coding=utf-8
 
 from .exceptions import *
+from .sparse import build_sparse, SPARSE_FORMATS, VALUE_TYPECODE, FLOAT_TYPECODE
+from .binary import write_binary, read_binary, is_binary
+from .diagnostics import *
+from .model import LPModel, CSRMatrix, transpose
+from .fileio import open_output, open_input, detect_compression
+from .stats import ParserStats, NO_STAGE, stats_enabled_by_env
+from collections import namedtuple, Counter
+from array import array
+import itertools
 import warnings
+import codecs
+import functools
+import sys
+import mmap
 import re as r
 
+# Intermediate representation of a single LP line.
+#
+#   variables -- the variables present in the line, in order of appearance
+#   width     -- the largest index of the variables of the line (0 if none)
+#   terms     -- (factor, column) pairs, column being 0-based
+#   relation  -- '<=', '>=', '=' or None if the line has no constraint type
+#   rhs       -- the right side argument or None if it is missing
+#   signs     -- the amount of signs found in the left side of the line
+#   integral  -- True if every factor and the rhs are integers
+_LPLine = namedtuple('_LPLine', ['variables', 'width', 'terms', 'relation', 'rhs', 'signs', 'integral'])
+
+# An integer, decimal or scientific number, i.e '3', '2.5', '.5' or '1e-3'.
+# A dot right after a letter (i.e 's.t.') never starts a number.
+_UNSIGNED = r'(?:\d+\.?\d*|(?<![a-z])\.\d+)(?:e[-+]?\d+)?'
+_NUMBER = r'[-+]?' + _UNSIGNED
+
+# Every pattern is compiled once, when the module is imported
+_TERM_RE = r.compile(r'([-+]?)(' + _UNSIGNED + r')?x(\d+)') # Sign, factor & index of a variable
+_RELATION_RE = r.compile(r'[><]?=')
+_RHS_RE = r.compile('(?<==)(' + _NUMBER + ')')
+
+# '+', '-' or ',' but not the sign of an exponent (i.e '1e-3')
+_SIGN_RE = r.compile(r'(?<!\de)[-,+]')
+
+def _to_number(token):
+    '''Converts a number token to an int, or to a float if it isn't an integer'''
+
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+def _scan_terms(text):
+    '''Scans `text` once from left to right and yields a
+       (sign, coefficient, column) tuple for every term in it.
+
+            i.e '3x1 - x10' -> (1, 3, 0), (-1, 1, 9)
+
+       Terms without a coefficient (i.e 'x10') get a coefficient of 1.
+    '''
+
+    for sign, coefficient, index in _TERM_RE.findall(text):
+        yield (-1 if sign == '-' else 1,
+               _to_number(coefficient) if coefficient else 1,
+               int(index) - 1)
+
+# The ways the constraints can be introduced, i.e 's.t. x1 + x2 <= 4'
+_INITIALIZERS = ('s.t.', 's.t', 'st', 'subjectto')
+
+# Sign, factor & name of a variable with any name, i.e '-2.5flow_17_42'.
+# Whitespace is removed, so in '3e+2y' the exponent can't have a sign:
+# it is read as 3e + 2y, not as 300y.
+_SYMBOL_UNSIGNED = r'(?:\d+\.?\d*|(?<![a-z])\.\d+)(?:e\d+)?'
+_SYMBOL_TERM_RE = r.compile(r'([-+]?)(' + _SYMBOL_UNSIGNED + r')?([a-z_][a-z0-9_]*)', r.I)
+
+# Factors have no signed exponents, so every sign counts (i.e 'node_2e-y')
+_SYMBOL_SIGN_RE = r.compile(r'[-,+]')
+
+def _scan_symbols(text):
+    '''Works like _scan_terms() for variables with any name and
+       yields a (sign, coefficient, name) tuple for every term.
+
+            i.e '3flow_1 - y' -> (1, 3, 'flow_1'), (-1, 1, 'y')
+
+       Names are interned, so every occurrence of a name shares one string.
+    '''
+
+    for sign, coefficient, name in _SYMBOL_TERM_RE.findall(text):
+        yield (-1 if sign == '-' else 1,
+               _to_number(coefficient) if coefficient else 1,
+               sys.intern(name))
+
+def _strip_prefix(line, prefixes):
+    '''Returns `line` without the first of `prefixes` it starts with (case insensitive)'''
+
+    lower = line.lower()
+    for prefix in prefixes:
+        if lower.startswith(prefix):
+            return line[len(prefix):]
+
+    return line
+
+def _has_initializer(line):
+    return any(i in line.lower() for i in _INITIALIZERS)
+
+def _to_int(value):
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError("{0!r} can't be represented as int. Use dtype=float or dtype=Fraction.".format(value))
+        return int(value)
+
+    return value
+
+def _is_fraction(dtype):
+    # fractions is only imported when it can actually be needed
+    if dtype in (None, int, float):
+        return False
+
+    from fractions import Fraction
+    return dtype is Fraction
+
+def _to_fraction(value):
+    from fractions import Fraction
+
+    # The shortest repr of a float is the number as it was written
+    # in the LP, so i.e 0.1 becomes exactly 1/10
+    return Fraction(repr(value)) if isinstance(value, float) else Fraction(value)
+
+def _converter(dtype):
+    '''Returns the function converting parsed numbers to `dtype`,
+       or None if dtype=None and they are kept as they are.
+    '''
+
+    if dtype is None:
+        return None
+    elif dtype is int:
+        return _to_int
+    elif dtype is float:
+        return float
+    elif _is_fraction(dtype):
+        return _to_fraction
+
+    raise ValueError("Unknown dtype {0!r}. Use one of: int, float, Fraction".format(dtype))
+
+# Values of the constraint types in Eqin
+_RELATIONS = {'<=': -1, '>=' : 1, '=' : 0}
+
+def _read_only(matrix):
+    '''Makes a freshly built matrix read-only before it is cached.
+
+       ndarrays are flagged as not writeable and the arrays of sparse
+       matrices become read-only memoryviews, so both can be handed out
+       without a copy. Dense lists are copied by _copy() instead.
+    '''
+
+    if isinstance(matrix, dict): # Sparse, the shape is a tuple
+        return {key:_read_only(value) for key, value in matrix.items()}
+
+    if isinstance(matrix, array):
+        return memoryview(matrix.tobytes()).cast(matrix.typecode)
+
+    if isinstance(matrix, list):
+        return matrix
+
+    if hasattr(matrix, 'flags'): # ndarray
+        matrix.flags.writeable = False
+
+    return matrix
+
+def _copy(matrix):
+    '''Returns the cached `matrix` the way it is handed out: lists and
+       lists of lists are copied, so the cache can't be modified through
+       them, while read-only matrices (see _read_only) are shared.
+    '''
+
+    if isinstance(matrix, dict):
+        return dict(matrix)
+
+    if isinstance(matrix, list):
+        if matrix and isinstance(matrix[0], list):
+            return [list(row) for row in matrix]
+        return list(matrix)
+
+    return matrix
+
+# Every modification of an _LPLines list gets a new, unique version
+_versions = itertools.count(1)
+
+class _LPLines(list):
+    '''The list holding the lines of an LP.
+
+       It behaves exactly like a list but it keeps a `version` that
+       changes whenever the list is modified. Results derived from the
+       lines can then tell in O(1) whether they are still valid.
+    '''
+
+    __slots__ = ('version',)
+
+    def __init__(self, *args):
+        list.__init__(self, *args)
+        self.version = next(_versions)
+
+def _modifies(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.version = next(_versions)
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+for _name in ['__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend',
+              'insert', 'pop', 'remove', 'clear', 'sort', 'reverse']:
+    setattr(_LPLines, _name, _modifies(getattr(list, _name)))
+
+# How many bytes from_stream() reads at a time
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Available return types for the matrices
+BACKENDS = ('list', 'numpy')
+
+def _import_numpy(backend):
+    '''Returns the numpy module if the `backend` needs it, otherwise None.
+
+       NumPy is an optional dependency, so it is only imported
+       when backend='numpy' is actually requested.
+    '''
+
+    if backend not in BACKENDS:
+        raise ValueError("Unknown backend '{0}'. Use one of: {1}".format(backend, ', '.join(BACKENDS)))
+
+    if backend == 'list':
+        return None
+
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("backend='numpy' requires NumPy to be installed")
+
+    return numpy
+
 class AplosParser:
-    lp_lines = []
-    error_list = []
-    constr_end_idx = -1
-    m = 0
-    n = 0
+    '''Parses the LP given as a file or as text.
+
+       All of the parser's state lives in the instance (see __slots__),
+       so parsers can be created and used concurrently from many threads.
+
+       Once detect_errors() has run, the read-only getters (get_vars,
+       get_dimensions, get_matrix/get_matrices, get_dual_matrix/get_dual_matrices,
+       iter_constraints, write_matrices_to_file) of a single parser may also be
+       called from several threads at once, as long as `lp_lines` isn't
+       modified meanwhile. At worst two threads compute the same cached
+       result twice, in which case cache_info() counts both as misses.
+
+       Editing the LP (add_constraint(), replace_constraint(), remove_constraint()
+       and set_objective()) modifies `lp_lines`, so it must not happen while
+       other threads use the parser.
+
+       For asyncio applications, from_stream() reads an LP from a stream
+       and adetect_errors(), aget_matrices() and aget_dual_matrices() run
+       the matching stages in `executor` instead of the event loop.
+    '''
+
+    __slots__ = (
+        'error_list', 'diagnostics', 'constr_end_idx', 'm', 'n', 'stats', 'executor', 'symbols',
+        '__lp_lines', '__parsed', '__resolved', '__vars', '__vars_version',
+        '__cache', '__cache_version', '__cache_hits', '__cache_misses',
+        '__weakref__',
+    )
+
+    def __iter_file_lines(self, filename):
+        '''Lazily yields the lines of a text file with their whitespace
+           removed, skipping the empty ones.
+
+           The file is streamed line by line and reading stops right
+           after the 'END' line, so whatever follows it is never read.
+           Like in detect_errors(), the first line can't be the 'END' one.
+           Compressed files (gzip, bz2, xz or zstd) are decompressed
+           on the fly.
+        '''
+
+        with open_input(filename) as lp_file:
+            first = True
+            for line in lp_file:
+                line = ''.join(line.split()) # Remove whitespace
+                if not line: # Filter empty lines
+                    continue
+
+                yield line
+
+                if not first and line.lower() == 'end':
+                    break
+                first = False
 
     def __read_file_lines(self, filename):
         '''Reads text file line by line'''
 
-        with open(filename, 'r') as lp_file:
-            text_lines = [''.join(line.split()) for line in lp_file.readlines()] # Remove whitespace
-            text_lines = list(filter(None, text_lines)) # Filter empty lines
-
-            return text_lines
+        return list(self.__iter_file_lines(filename))
 
     def __read_text_lines(self, text, delimeter):
             '''Processes text to desired format'''
 
-            text_lines = text.replace(' ','').split(delimeter) # Remove whitespace
+            # Remove whitespace, including the '\r' of '\r\n' line endings
+            text_lines = [''.join(line.split()) for line in text.split(delimeter)]
             text_lines = list(filter(None, text_lines)) # Filter empty lines
 
             return text_lines
 
-    def __process_factors(self, matrix, line, line_idx=None):
-        '''Τhis function is in charge of returning a list with the 
-            factors from the given line. 
-            
-            Firstly, it finds the variables that 
-            have 'hiden' factors, like 'x1' the hidden factor of which is 1,
-            and it adds those missing factors back.
-            
-            It then finds the factors and the index of the variables they belong
-            with two regex searches. 
+    def __parse_line(self, line):
+        '''This function tokenizes a single LP line and returns its
+            intermediate representation (see _LPLine).
 
-                i.e '1x1 + 3x3 - 2x4' 
-                    -> factor = [1,+3,-2]
-                    -> factor_pos = [1,3,4]
-            
-            After all that is said and done it fills up the given matrix
-            with the factors and returns it.
+            The terms of the line are found by a single left to right scan
+            (see _scan_terms), which adds the 'hidden' factors back, like
+            the factor of 'x1' which is 1.
+
+                i.e '1x1 + 3x3 - x4'
+                    -> terms = [(1, 0), (3, 2), (-1, 3)]
 
-            ! The function is built to run both for 1D and 2D lists.
+            Factors and right side arguments can be integers, decimals or
+            in scientific notation (i.e '2.5x1 - 1e-3x2 <= -0.5'). They are
+            matched by a single precompiled pattern and converted in bulk,
+            to int when they are integers and to float otherwise.
+
+            Every getter reads from the result of this function, so each
+            line is tokenized only once no matter how many getters are called.
         '''
 
-        # Add missing factors
-        prob_fact = r.findall(r'(?<!\d)x\d+', line)
-        for fac in prob_fact:
-            line = line.replace(fac, '1' + fac)
-            
-        factors = r.findall(r'([-–+]?\d+)(?=x\d+)', line) # Different hyphens
-        factor_pos = r.findall(r'(?<=x)\d+', line) # Indices of variables
+        if self.symbols:
+            return self.__parse_symbols(line)
 
-        # Set values
-        for i,fact in enumerate(factors):
-            fac_pos = int(factor_pos[i]) - 1
-            number = int(fact.replace('+', '').replace('–', '-')) # Replace em-dash with en-dash
+        # 'Max' in the first line causes a problem since
+        # the regex will then count 'Max 3x2' as two matches
+        # of 'x3' and 'x2'
+        body = line.lower().replace('max', '').replace('min', '').replace('–', '-') # Different hyphens
 
-            if isinstance(matrix[0], list):
-                matrix[line_idx][fac_pos] = number
-            else:
-                matrix[fac_pos] = number
-        
-        if isinstance(matrix[0], list):
-            for i,row in enumerate(matrix):
-                matrix[i] = [0 if el is None else el for el in row]
-        else:
-            matrix = [0 if el is None else el for el in matrix]
+        scanned = tuple(_scan_terms(body))
 
-        return matrix
+        variables = tuple('x' + str(column + 1) for _, _, column in scanned)
+        width = max(column for _, _, column in scanned) + 1 if scanned else 0
+
+        relation = _RELATION_RE.search(body)
+        lhs = body[:relation.start()] if relation else body
+        relation = relation.group() if relation else None
+
+        signs = len(_SIGN_RE.findall(lhs))
+
+        terms = tuple((sign * coefficient, column) for sign, coefficient, column in scanned)
+
+        rhs = _RHS_RE.search(body)
+        rhs = _to_number(rhs.group(1)) if rhs else None
+
+        integral = not any(isinstance(fact, float) for fact, _ in terms) and not isinstance(rhs, float)
 
-    def __init__(self, filename=None, text=None, delimeter='\n'):
+        return _LPLine(variables, width, terms, relation, rhs, signs, integral)
+
+    def __parse_symbols(self, line):
+        '''Works like __parse_line() for LPs whose variables can have
+            any name, i.e 'max 3flow_1 + 2y'.
+
+            The terms of the line hold (factor, name) pairs instead of
+            (factor, column) ones and the width is 0. Names only get their
+            columns from the symbol table of the whole LP, see __resolve().
+        '''
+
+        body = line.replace('–', '-') # Different hyphens
+        lower = body.lower()
+
+        relation = _RELATION_RE.search(lower)
+        lhs = relation.start() if relation else len(lower)
+        relation = relation.group() if relation else None
+
+        # Only the left side holds terms, on the right side
+        # '1e5' would be read as 1 times a variable 'e5'
+        scanned = tuple(_scan_symbols(body[:lhs]))
+        variables = tuple(name for _, _, name in scanned)
+
+        signs = len(_SYMBOL_SIGN_RE.findall(lower[:lhs]))
+
+        terms = tuple((sign * coefficient, name) for sign, coefficient, name in scanned)
+
+        rhs = _RHS_RE.search(lower)
+        rhs = _to_number(rhs.group(1)) if rhs else None
+
+        integral = not any(isinstance(fact, float) for fact, _ in terms) and not isinstance(rhs, float)
+
+        return _LPLine(variables, 0, terms, relation, rhs, signs, integral)
+
+    def __line(self, line_idx):
+        '''Returns the intermediate representation of the line at `line_idx`.
+
+           Lines are parsed lazily and memoized by their text, so a line
+           is never tokenized twice - even if `lp_lines` gets trimmed
+           by detect_errors() in the meantime.
+
+           With symbols=True the variables of the line are
+           resolved to their columns, see __resolve().
+        '''
+
+        if self.symbols:
+            text = self.__strip_keywords(line_idx, self.lp_lines[line_idx])
+            return self.__resolve(text, self.__parse_text(text))
+
+        return self.__parse_text(self.lp_lines[line_idx])
+
+    def __raw_line(self, line_idx):
+        '''Returns the intermediate representation of the line at `line_idx`
+           without resolving its variables. It is all validation needs.
+        '''
+
+        return self.__parse_text(self.__strip_keywords(line_idx, self.lp_lines[line_idx]))
+
+    def __strip_keywords(self, line_idx, line):
+        '''With symbols=True, returns `line` without its leading 'min'/'max'
+           (objective function) or constraint initializer (first constraint),
+           which would otherwise be read as part of a name since whitespace
+           is removed. Otherwise `line` is returned as is.
+        '''
+
+        if not self.symbols or line_idx > 1:
+            return line
+
+        if line_idx == 0:
+            return _strip_prefix(line, ['max', 'min'])
+
+        return _strip_prefix(line, ['subjectto', 's.t.', 's.t', 'st'])
+
+    def __resolve(self, text, parsed):
+        '''Returns the parsed line `text` with every variable name
+           replaced by its column in the symbol table of the LP.
+
+           Resolved lines are memoized until the symbol table changes.
+        '''
+
+        columns = self.__var_index()['columns']
+
+        resolved = self.__resolved.get(text)
+        if resolved is None:
+            terms = tuple((factor, columns[name]) for factor, name in parsed.terms)
+            width = max(col for _, col in terms) + 1 if terms else 0
+
+            resolved = self.__resolved[text] = parsed._replace(terms=terms, width=width)
+
+        return resolved
+
+    def __parse_text(self, line):
+        '''Returns the intermediate representation of the text `line`,
+           tokenizing it only if it hasn't been tokenized before.
+        '''
+
+        parsed = self.__parsed.get(line)
+        if parsed is None:
+            with self.__stage('tokenize'):
+                parsed = self.__parsed[line] = self.__parse_line(line)
+
+        return parsed
+
+    def __process_factors(self, terms, width, convert=None):
+        '''This function returns a single, zero-initialized row of
+            `width` elements filled up with the given (factor, column)
+            terms of a line, converted with `convert` if given.
+
+            Every row is built once and is only written by its own line,
+            so building a whole matrix is linear in its size.
+        '''
+
+        if convert:
+            row = [convert(0)] * width
+            for number, fac_pos in terms:
+                row[fac_pos] = convert(number)
+
+            return row
+
+        row = [0] * width
+        for number, fac_pos in terms:
+            row[fac_pos] = number
+
+        return row
+
+    def __cached(self, key, compute):
+        '''Returns the cached value stored under `key`, calling
+           `compute()` to calculate it on a miss.
+
+           The cache belongs to the current contents of `lp_lines`.
+           If the lines have changed since the cache was filled it
+           is emptied first, along with the dimensions m & n.
+        '''
+
+        if self.lp_lines.version != self.__cache_version:
+            self.__cache = {}
+            self.__cache_version = self.lp_lines.version
+            self.m = self.n = 0
+
+        if key in self.__cache:
+            self.__cache_hits += 1
+            return self.__cache[key]
+
+        self.__cache_misses += 1
+        with self.__stage('get_matrix' if key[0] == 'primal' else 'get_dual_matrix'):
+            value = self.__cache[key] = _read_only(compute())
+
+        return value
+
+    def __var_index(self):
+        '''Returns the variable index of the LP, a dict with:
+
+            names   -- the full list of variables, as returned by get_vars()
+            columns -- variable name -> 0-based column
+            widths  -- line width -> number of lines that wide
+
+           The index is built once from the parsed lines and is only
+           rebuilt if `lp_lines` changes. Lines that were already
+           tokenized are not tokenized again.
+
+           With symbols=True the index is the symbol table of the LP: every
+           name gets the next column the first time it appears, so there are
+           as many columns as distinct names. 'widths' is then None.
+        '''
+
+        if self.symbols and self.lp_lines.version != self.__vars_version:
+            with self.__stage('get_vars'):
+                columns = {}
+                for idx, line in enumerate(self.lp_lines):
+                    if idx > 0 and line.lower() == 'end':
+                        break
+
+                    for name in self.__raw_line(idx).variables:
+                        if name not in columns:
+                            columns[name] = len(columns)
+
+                self.__vars = {'names':list(columns), 'columns':columns, 'widths':None}
+                self.__vars_version = self.lp_lines.version
+                self.__resolved = {}
+
+        elif self.lp_lines.version != self.__vars_version:
+            with self.__stage('get_vars'):
+                # The full list is as wide as the widest line.
+                # Lines without variables (i.e 'END') have a width of 0.
+                widths = Counter(self.__line(idx).width for idx in range(len(self.lp_lines)))
+                width = max(widths) if widths else 0
+
+                names = ['x' + str(i) for i in range(1, width+1)]
+                self.__vars = {'names':names, 'columns':{name:col for col, name in enumerate(names)}, 'widths':widths}
+                self.__vars_version = self.lp_lines.version
+
+        return self.__vars
+
+    @property
+    def lp_lines(self):
+        '''The lines of the LP, with their whitespace removed.'''
+
+        return self.__lp_lines
+
+    @lp_lines.setter
+    def lp_lines(self, lines):
+        self.__lp_lines = _LPLines(lines)
+
+    def __stage(self, name):
+        '''Returns a context manager recording the stage `name`
+           in `stats`, or one that does nothing if stats are disabled.
+        '''
+
+        return self.stats.record(name) if self.stats else NO_STAGE
+
+    def __setup(self, stats, executor=None, symbols=False):
+        '''Initializes every attribute of the parser except for `lp_lines`'''
+
+        # With symbols=True variables can have any name (see __parse_symbols),
+        # otherwise they are x1, x2, ... and their number is their column
+        self.symbols = symbols
+
+        # Per-stage statistics, see Aplos.stats.ParserStats.
+        # stats=True creates a new ParserStats and a ParserStats
+        # instance is used as is. By default stats are only enabled
+        # if the APLOS_STATS environment variable is set.
+        if stats is None:
+            stats = stats_enabled_by_env()
+        self.stats = ParserStats() if stats is True else (stats or None)
+
+        self.error_list = []
+        self.diagnostics = []
+        self.constr_end_idx = -1
+        self.m = 0
+        self.n = 0
+
+        self.__parsed = {} # Line text -> _LPLine
+        self.__resolved = {} # Line text -> _LPLine with columns, see __resolve()
+
+        # Variable index, see __var_index()
+        self.__vars = None
+        self.__vars_version = None
+
+        # Matrix cache, see __cached()
+        self.__cache = {}
+        self.__cache_version = None
+        self.__cache_hits = 0
+        self.__cache_misses = 0
+
+        # Executor running the stages of the async API, None
+        # for the default executor of the event loop
+        self.executor = executor
+
+    def __init__(self, filename=None, text=None, delimeter='\n', stats=None, executor=None, symbols=False):
+
+        self.__setup(stats, executor, symbols)
 
         if filename and not text:
-            self.lp_lines = self.__read_file_lines(filename=filename)
+            with self.__stage('read'):
+                self.lp_lines = self.__read_file_lines(filename=filename)
         elif not filename and (text or text == ''):
             # We check for an empty string here because we want
             # to raise a warning instead of raising an exception.
             # If we used 'not filename and text' an exception would
             # be thrown on an empty string
 
-            self.lp_lines = self.__read_text_lines(text,delimeter)
+            with self.__stage('read'):
+                self.lp_lines = self.__read_text_lines(text,delimeter)
         else:
             raise MissingArgumentsException('No \'text\' or \'filename\' argument specified for initialization')
 
         if not self.lp_lines:
             warnings.warn('LP lines are empty, no data is available', RuntimeWarning)
 
+    @classmethod
+    async def from_stream(cls, reader, delimeter='\n', encoding='utf-8', executor=None, stats=None, symbols=False):
+        '''Creates a parser from an asyncio.StreamReader (or any object
+           with an async read(n) method returning bytes) without blocking
+           the event loop.
+
+                i.e parser = await AplosParser.from_stream(reader)
+
+           The stream is consumed in chunks of STREAM_CHUNK_SIZE bytes and
+           every complete line is processed as soon as it arrives, exactly
+           like the lines of `text` are. Reading stops with the chunk that
+           completes the 'END' line, so the rest of the stream is never read.
+
+           `executor` (i.e a ThreadPoolExecutor) runs the CPU-heavy stages of
+           adetect_errors(), aget_matrices() and aget_dual_matrices(). By
+           default the executor of the event loop is used.
+        '''
+
+        parser = cls.__new__(cls)
+        parser.__setup(stats, executor, symbols)
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        lines = []
+        pending = ''
+        at_eof = False
+
+        while not at_eof:
+            chunk = await reader.read(STREAM_CHUNK_SIZE)
+            at_eof = not chunk
+            pending += decoder.decode(chunk, final=at_eof)
+
+            # Only the complete lines are processed, the
+            # last one might continue in the next chunk
+            if at_eof:
+                complete, pending = pending, ''
+            else:
+                complete, _, pending = pending.rpartition(delimeter)
+
+            start = len(lines)
+            lines.extend(parser.__read_text_lines(complete, delimeter))
+
+            # Only the new lines can hold the 'END' statement
+            end_idx = next((idx for idx in range(max(start, 1), len(lines)) if lines[idx].lower() == 'end'), -1)
+            if end_idx != -1:
+                del lines[end_idx + 1:]
+                break
+
+        parser.lp_lines = lines
+
+        if not parser.lp_lines:
+            warnings.warn('LP lines are empty, no data is available', RuntimeWarning)
+
+        return parser
+
+    async def __run(self, function, *args, **kwargs):
+        '''Runs `function` in the parser's executor and waits for its result'''
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: function(*args, **kwargs))
+
+    async def adetect_errors(self, print_msg=False, fail_fast=False):
+        '''Async version of detect_errors(), run in the parser's executor'''
+
+        return await self.__run(self.detect_errors, print_msg, fail_fast)
+
+    async def aget_matrices(self, sparse=False, format='coo', backend='list', dtype=None):
+        '''Async version of get_matrices(), run in the parser's executor'''
+
+        return await self.__run(self.get_matrices, sparse, format, backend, dtype)
+
+    async def aget_dual_matrices(self, sparse=False, format='coo', backend='list'):
+        '''Async version of get_dual_matrices(), run in the parser's executor'''
+
+        return await self.__run(self.get_dual_matrices, sparse, format, backend)
+
+    def cache_info(self):
+        '''Returns a dict with the statistics of the matrix cache.
+
+           hits   -- the number of matrices returned from the cache
+           misses -- the number of matrices that had to be computed
+           size   -- the number of matrices currently cached
+
+           Every primal and dual matrix is computed once and then
+           served from the cache until `lp_lines` changes. Lists are
+           returned as copies, so modifying them leaves the cache intact.
+           ndarrays and sparse arrays are shared with the cache and are
+           read-only.
+        '''
+
+        return {'hits':self.__cache_hits, 'misses':self.__cache_misses, 'size':len(self.__cache)}
+
+    def cache_clear(self):
+        '''Empties the matrix cache and resets its statistics.'''
+
+        self.__cache = {}
+        self.__cache_version = None
+        self.__cache_hits = 0
+        self.__cache_misses = 0
+
+    def get_var_index(self):
+        '''This function returns a dict mapping every variable
+           of the LP to its (0-based) column in the matrices.
+
+                i.e for 'max 3x1 + 2x3 , st x1 + x2 <= 4 , END'
+
+                it returns {'x1':0, 'x2':1, 'x3':2}
+
+           The dict is shared with the parser and must not be modified.
+        '''
+
+        return self.__var_index()['columns']
+
+    def iter_constraints(self):
+        '''This function is a generator that yields the constraints
+           of the LP one by one, each as a dict:
+
+                i.e for 'x1 + 2x3 <= 9' it yields
+
+                {"terms":[(1, 0), (2, 2)], "relation":'<=', "rhs":9}
+
+           where "terms" holds (factor, column) pairs with 0-based columns.
+
+           Constraints are tokenized as they are requested and iteration
+           stops at the 'END' line. It can be used to feed the rows of
+           the LP directly to a solver, without building any matrices.
+
+           Lines that weren't tokenized before are not memoized either, so
+           only one parsed constraint is held at a time. With symbols=True
+           every line is still parsed once up front, to build the symbol table.
+        '''
+
+        if not self.lp_lines:
+            raise EmptyLPException("Given LP is empty. Can't iterate over constraints.")
+
+        for idx in range(1, len(self.lp_lines)):
+            if self.lp_lines[idx].lower() == 'end':
+                break
+
+            parsed = self.__stream_line(idx)
+            yield {"terms":list(parsed.terms), "relation":parsed.relation, "rhs":parsed.rhs}
+
+    @classmethod
+    def iter_file_constraints(cls, filename, symbols=False):
+        '''This function is a generator that yields the constraints of
+           the LP file `filename` one by one, like iter_constraints() does.
+
+                i.e for constraint in AplosParser.iter_file_constraints('lp.txt'): ...
+
+           The file is streamed: every line is read, tokenized and dropped
+           before the next one, so memory doesn't grow with the size of the
+           file. Reading stops at the 'END' line. With symbols=True the
+           columns are given as the names appear, exactly like the symbol
+           table of a parser gives them.
+
+           The LP is not validated. Use detect_errors() on a parser
+           for that.
+        '''
+
+        parser = cls.__new__(cls)
+        parser.__setup(None, symbols=symbols)
+
+        columns = {}
+        for idx, line in enumerate(parser.__iter_file_lines(filename)):
+            if idx > 0 and line.lower() == 'end':
+                break
+
+            parsed = parser.__parse_line(parser.__strip_keywords(idx, line))
+
+            terms = parsed.terms
+            if symbols:
+                terms = tuple((factor, columns.setdefault(name, len(columns))) for factor, name in terms)
+
+            # The objective function only adds names to the symbol table
+            if idx > 0:
+                yield {"terms":list(terms), "relation":parsed.relation, "rhs":parsed.rhs}
+
+    def __stream_line(self, line_idx):
+        '''Works like __line() for iter_constraints(), except that lines
+           which weren't tokenized before are not added to the memo.
+        '''
+
+        text = self.__strip_keywords(line_idx, self.lp_lines[line_idx])
+
+        parsed = self.__parsed.get(text)
+        if parsed is None:
+            with self.__stage('tokenize'):
+                parsed = self.__parse_line(text)
+
+        if self.symbols:
+            columns = self.__var_index()['columns']
+            parsed = parsed._replace(terms=tuple((factor, columns[name]) for factor, name in parsed.terms))
+
+        return parsed
+
     def get_vars(self, line_idx=None):
         '''This function if not given an index returns the full list of variables 
            present in the LP.
@@ -112,106 +835,144 @@ class AplosParser:
                 returns the following dict:
 
                 {"existing":['x1','x3','x4'], "extended":['x1','x2','x3','x4']}   
+
+            The full list comes from the parser's variable index, so it
+            is only computed once. It is shared with the parser and must
+            not be modified.
         '''
 
 
         if line_idx == None:
 
-            maxim = []
-            
-            # We ignore the last line because it should contain 'END'.
-            # If we don't ignore it we will get an IndexError later on
-            # since there'd be no regex matches for us to access.
-            for idx,line in enumerate(self.lp_lines[:-1]):
-                variables = self.get_vars(line_idx=idx)['extended']
-                if len(variables) > len(maxim):
-                    maxim = variables
-            
-            return maxim
+            return self.__var_index()['names']
 
         else:
 
             if line_idx > len(self.lp_lines) : raise IndexError()
 
-            # 'Max' in the first line causes a problem since
-            # the regex will then count 'Max 3x2' as two matches
-            # of 'x3' and 'x2'
-            line = self.lp_lines[line_idx].lower().replace('max', '')
-
-            var_list = r.findall(r'x\d+', line)
-            extended_list = []
+            parsed = self.__line(line_idx)
 
             # Add missing variables
             # If the list is empty that means there are no variables
             # in the given line, hence the LP is faulty.
-            if var_list != []:
-                last_idx = int(var_list[-1][1:])
-                for i in range(1, last_idx+1):
-                    extended_list.append('x' + str(i))
+            if self.symbols:
+                extended_list = self.__var_index()['names'][:parsed.width]
+            else:
+                extended_list = ['x' + str(i) for i in range(1, parsed.width+1)]
+
+            return {"existing":list(parsed.variables), "extended":extended_list}
+
+    def __objective_errors(self, line):
+        '''Yields a Diagnostic for every problem of the objective function `line`'''
+
+        objective = line.lower()
+
+        # Only the start of the objective can tell
+        # 'min' from names like 'minimum_cost'
+        if self.symbols:
+            objective = objective[:3]
+
+        # Min/Max not specified
+        if all(i not in objective for i in ['min', 'max']):
+            yield Diagnostic(MINMAX_MISSING, 0, 0)
+
+        # Both Min & Max specified
+        if all(i in objective for i in ['min', 'max']):
+            yield Diagnostic(MINMAX_AMBIGUOUS, 0, 0)
+
+    def __line_errors(self, idx, line, parsed):
+        '''Yields a Diagnostic for every problem of `line`, the line at
+           `idx`, given its intermediate representation `parsed`.
+        '''
+
+        if idx > 0:
+            # Missing constraint type
+            if parsed.relation is None:
+                yield Diagnostic(TYPE_MISSING, idx)
 
+            # Missing right side argument
+            if parsed.rhs is None:
+                column = line.find('=') + 1 if parsed.relation else None
+                yield Diagnostic(RHS_MISSING, idx, column)
 
-            return {"existing":var_list, "extended":extended_list}
+        # Missing signs from factors
+        if not parsed.signs <= len(parsed.variables) <= parsed.signs + 1:
+            yield Diagnostic(SIGN_MISSING, idx)
+
+    def __scan_errors(self):
+        '''This generator validates the LP in a single pass over
+            `lp_lines` and yields a Diagnostic for every problem,
+            in the order the problems are found.
+
+            Once the 'END' line is reached, it and every line after
+            it are removed from `lp_lines`.
+        '''
+
+        lines = self.lp_lines
+
+        for diagnostic in self.__objective_errors(lines[0]):
+            yield diagnostic
+
+        # No constraint initializer
+        if len(lines) < 2 or not _has_initializer(lines[1]):
+            yield Diagnostic(ST_MISSING, 1, 0)
+
+        # If the LP has already been checked its 'END'
+        # line is gone, but the LP still ends there.
+        end_idx = -1
+        if self.constr_end_idx == len(lines):
+            end_idx = self.constr_end_idx
 
-    def detect_errors(self, print_msg=False):
+        for idx, line in enumerate(lines):
+
+            # Check for 'END' statement
+            if idx > 0 and 'end' == line.lower():
+                end_idx = idx
+                break
+
+            for diagnostic in self.__line_errors(idx, line, self.__raw_line(idx)):
+                yield diagnostic
+
+        if end_idx == -1:
+            yield Diagnostic(END_MISSING, len(lines))
+        else:
+            self.constr_end_idx = end_idx
+
+            # Checking an LP again leaves its lines (and the cache) untouched
+            if end_idx < len(lines):
+                del lines[end_idx:] # Remove every line after (and including) the one containing the END statement
+
+    def detect_errors(self, print_msg=False, fail_fast=False):
         '''This function collects the many possible errors in the syntax 
             of the given LP. 
             
             It returns the error_list which contains
-            messages with the errors
+            messages with the errors, one message for each kind of error.
+
+            Every single problem found is also stored in `diagnostics`
+            as a Diagnostic object (code, line, column and message).
+            The LP is checked in a single pass. With fail_fast=True the
+            check stops at the first problem found.
             
             An exception is thrown if the LP contains no lines
             and a warning is raised if there are errors in the LP.
         '''
         
         self.error_list = [] # Reset error_list
+        self.diagnostics = []
 
         if not self.lp_lines:
             raise EmptyLPException("Given LP is empty. Can't detect errors")
 
-        # Min/Max not specified
-        if all(i not in self.lp_lines[0].lower() for i in ['min', 'max']):
-            self.error_list.append('Min/Max is not specified for object function')
-
-        # Both Min & Max specified
-        if all(i in self.lp_lines[0].lower() for i in ['min', 'max']):
-            self.error_list.append('Optimization way is ambiguous. Use either min or max.')
-
-        # No constraint initializer
-        if all(i not in self.lp_lines[1].lower() for i in ['s.t.', 's.t', 'st', 'subjectto']):
-            self.error_list.append("Constraint initializer 's.t' or similar is missing")
-
-        # Check for 'END' statement
-        # and remove the lines after it.
-        for i,line in enumerate(self.lp_lines[1:]):
-            if 'end' == line.lower():
-                self.constr_end_idx = i + 1 # Since we start the loop from the 2nd element
-                self.lp_lines[:] = self.lp_lines[:self.constr_end_idx] # Remove every line after (and including) the one containing the END statement
-                break
-        else: # If for loop doesn't break
-            self.error_list.append('No END statement found')    
-        
-        # Missing constraint types
-        for line in self.lp_lines[1:]:
-            if all(i not in line for i in ['=','<=','>=']):
-                self.error_list.append('Constraint type missing from some constraints')
-                break
-
-        # Missing right side arguments
-        for line in self.lp_lines[1:]:
-            right_side = r.findall(r'=\d+', line)
-            if not right_side:
-                self.error_list.append('Right side argument missing from some constraints')
-                break
-
-        # Missing signs from factors
-        for idx,line in enumerate(self.lp_lines):
-
-            variables = len(self.get_vars(idx)["existing"])
-            signs = len(r.findall(r'[-,+]', line))
+        with self.__stage('detect_errors'):
+            for diagnostic in self.__scan_errors():
+                self.diagnostics.append(diagnostic)
+                if fail_fast:
+                    break
 
-            if not signs <= variables <= signs + 1:
-                self.error_list.append('Sign missing from some factors')
-                break
+        # One message for each kind of error found
+        found = set(d.code for d in self.diagnostics)
+        self.error_list = [MESSAGES[code] for code in CODES if code in found]
         
         # Print message containing the error messages (if any)
         if print_msg:
@@ -256,7 +1017,7 @@ class AplosParser:
         else:
             raise LPErrorException("Given LP contains errors. Can't get dimensions")
 
-    def get_matrix(self, matrix=None):
+    def get_matrix(self, matrix=None, sparse=False, format='coo', backend='list', dtype=None):
         '''This function returns the LP matrix corresponding
             to the given matrix argument given.
 
@@ -264,6 +1025,31 @@ class AplosParser:
 
             Eqin -- '<=': -1 | '>=' : 1 | '=' : 0
             MinMax -- 'max':1 | 'min':-1
+
+            If sparse=True, 'A' is returned in sparse form instead of
+            a dense list of lists. `format` selects the sparse layout,
+            'coo' or 'csr' (see Aplos.sparse.build_sparse). The sparse
+            matrix is built in one pass over the constraint terms and
+            can be converted with Aplos.to_scipy() if SciPy is installed.
+
+            With backend='numpy' the matrix is written directly into a
+            preallocated int64 ndarray instead of a (nested) list.
+            Sparse matrices are always array-backed, regardless of `backend`.
+
+            Lists are returned as copies. ndarrays and the arrays of sparse
+            matrices (read-only memoryviews) are shared with the cache
+            without a copy, so they are read-only.
+
+            `dtype` sets the type of the numbers of 'A', 'b' and 'c':
+
+             None     -- as written in the LP, int for integers and float
+                         otherwise. NumPy arrays and sparse matrices are
+                         float64 if any number of the LP isn't an integer.
+             int      -- a ValueError is raised for non-integer numbers
+             float    -- every number is converted to float
+             Fraction -- exact rationals, i.e '0.1' becomes Fraction(1, 10).
+                         NumPy arrays then have dtype=object and sparse
+                         matrices use plain lists.
         '''
 
         # Make sure the problem can be parsed with our mind
@@ -278,57 +1064,146 @@ class AplosParser:
         if not self.error_list and self.constr_end_idx == -1:
             raise LPErrorException("Given LP may contain errors. Search for errors first.")
         
-        elif self.error_list and self.constr_end_idx != -1:
+        elif self.error_list:
             raise LPErrorException("Given LP contains errors. Can't get dimensions")
        
         else:
-            # Make sure m & n are assigned to the parser object
-            if not self.m or not self.n : self.get_dimensions()
+            np = _import_numpy(backend)
+            if sparse: np = None
+            _converter(dtype) # Fail early on unknown types
 
-            if matrix.lower() == 'a':
-                A = [[None]*self.n for _ in range(self.m)]
-                for i,line in enumerate(self.lp_lines[1:]):
-                    A = self.__process_factors(A, line, i)
-                
-                return A
-            
-            elif matrix.lower() == 'b':
-                b = [None]*self.m
-                for i,line in enumerate(self.lp_lines[1:]):
-                    b[i] = int(r.findall(r'(?<==)(\d+)', line)[0])
+            return _copy(self.__matrix(matrix, sparse, format, np, dtype))
 
-                return b
-            
-            elif matrix.lower() == 'c':
-                c = [None]*self.n
-                line_to_proc = self.lp_lines[0].lower().replace('max', '').replace('min', '')
-                c = self.__process_factors(c, line_to_proc)
+    def __matrix(self, matrix, sparse=False, format='coo', np=None, dtype=None):
+        '''Returns the primal `matrix` from the cache, building it on a miss.
+           The matrix is shared with the cache and must not be modified.
+        '''
 
-                return c
-            
-            elif matrix.lower() == 'eqin':
-                Eqin = [None]*self.m
-                con_vals = {'<=': -1, '>=' : 1, '=' : 0}
+        return self.__cached(('primal', matrix.lower(), sparse and format, bool(np), dtype),
+                             lambda: self.__build_matrix(matrix, sparse, format, np, dtype))
 
-                for i,line in enumerate(self.lp_lines[1:]):
-                    con_type = r.findall(r'[><]?=', line)[0]
-                    Eqin[i] = con_vals[con_type]
-                
-                return Eqin
+    def __integral(self):
+        '''Returns True if every number of the LP is an integer'''
+
+        return all(self.__line(i).integral for i in range(self.m + 1))
+
+    def __build_matrix(self, matrix, sparse, format, np=None, dtype=None):
+        '''Computes the given matrix for get_matrix(). Results are cached.
+
+           If the numpy module is given as `np` an ndarray is built
+           instead of a list. Numbers are converted to `dtype`.
+        '''
+
+        # Make sure m & n are assigned to the parser object
+        if not self.m or not self.n : self.get_dimensions()
+
+        if sparse and matrix.lower() != 'a':
+            raise ValueError("Only matrix 'A' can be returned in sparse form.")
+
+        if np:
+            return self.__build_ndarray(matrix, np, dtype)
+
+        convert = _converter(dtype)
+
+        if matrix.lower() == 'a' and sparse:
+            if _is_fraction(dtype):
+                typecode = None
+            elif dtype is float or (dtype is None and not self.__integral()):
+                typecode = FLOAT_TYPECODE
+            else:
+                typecode = VALUE_TYPECODE
+
+            rows = (self.__line(i+1).terms for i in range(self.m))
+            if convert:
+                rows = ([(convert(number), col) for number, col in terms] for terms in rows)
+
+            return build_sparse(rows, (self.m, self.n), format, typecode)
 
-            elif matrix.lower() == 'minmax':
-                MinMax = []
-                if 'min' in self.lp_lines[0].lower():
-                    MinMax.append(-1)
-                elif 'max' in self.lp_lines[0].lower():
-                    MinMax.append(1) 
+        elif matrix.lower() == 'a':
+            A = [self.__process_factors(self.__line(i+1).terms, self.n, convert) for i in range(self.m)]
 
-                return MinMax            
+            return A
 
-    def get_matrices(self):
+        elif matrix.lower() == 'b':
+            b = [None]*self.m
+            for i in range(self.m):
+                b[i] = self.__line(i+1).rhs
+
+            return list(map(convert, b)) if convert else b
+
+        elif matrix.lower() == 'c':
+            c = self.__process_factors(self.__line(0).terms, self.n, convert)
+
+            return c
+
+        elif matrix.lower() == 'eqin':
+            Eqin = [None]*self.m
+
+            for i in range(self.m):
+                Eqin[i] = _RELATIONS[self.__line(i+1).relation]
+
+            return Eqin
+
+        elif matrix.lower() == 'minmax':
+            return [self.__min_max()]
+
+    def __build_ndarray(self, matrix, np, dtype=None):
+        '''Computes the given matrix for get_matrix() as an ndarray.
+
+           Every array is preallocated with its final shape and
+           filled up in place, without building a list first.
+        '''
+
+        if matrix.lower() in ['eqin', 'minmax']:
+            return np.array(self.__matrix(matrix), dtype=np.int64)
+
+        # Fractions can only be held by object arrays
+        if _is_fraction(dtype):
+            return np.array(self.__matrix(matrix, dtype=dtype), dtype=object)
+
+        if dtype is float or (dtype is None and not self.__integral()):
+            np_dtype = np.float64
+        else:
+            np_dtype = np.int64
+            if dtype is int and not self.__integral():
+                # Let _to_int reject the numbers that aren't integers,
+                # straight from the parsed lines
+                if matrix.lower() == 'b':
+                    numbers = (self.__line(i+1).rhs for i in range(self.m))
+                else:
+                    lines = [0] if matrix.lower() == 'c' else range(1, self.m + 1)
+                    numbers = (number for i in lines for number, _ in self.__line(i).terms)
+
+                for number in numbers:
+                    _to_int(number)
+
+        if matrix.lower() == 'a':
+            A = np.zeros((self.m, self.n), dtype=np_dtype)
+            for i in range(self.m):
+                row = A[i]
+                for number, fac_pos in self.__line(i+1).terms:
+                    row[fac_pos] = number
+
+            return A
+
+        elif matrix.lower() == 'b':
+            rhs = (self.__line(i+1).rhs for i in range(self.m))
+            return np.fromiter(rhs, dtype=np_dtype, count=self.m)
+
+        elif matrix.lower() == 'c':
+            c = np.zeros(self.n, dtype=np_dtype)
+            for number, fac_pos in self.__line(0).terms:
+                c[fac_pos] = number
+
+            return c
+
+    def get_matrices(self, sparse=False, format='coo', backend='list', dtype=None):
         '''This function returns a dict containing each and every
             matrix available from get_matrix. 
 
+            `sparse` and `format` are passed on to get_matrix('A'),
+            `dtype` to 'A', 'b' & 'c' and `backend` to every matrix.
+
             No tests are run for get_matrices() since it is covered but
             the tests on get_matrix().
         '''
@@ -339,28 +1214,228 @@ class AplosParser:
         if not self.error_list and self.constr_end_idx == -1:
             raise LPErrorException("Given LP may contain errors. Search for errors first.")
         
-        elif self.error_list and self.constr_end_idx != -1:
+        elif self.error_list:
             raise LPErrorException("Given LP contains errors. Can't get dimensions")
        
         else:
-            m_A = self.get_matrix('a')
-            m_b = self.get_matrix('b')
-            m_c = self.get_matrix('c')
-            m_Eqin = self.get_matrix('Eqin')
-            m_minMax = self.get_matrix('minmax')
+            m_A = self.get_matrix('a', sparse=sparse, format=format, backend=backend, dtype=dtype)
+            m_b = self.get_matrix('b', backend=backend, dtype=dtype)
+            m_c = self.get_matrix('c', backend=backend, dtype=dtype)
+            m_Eqin = self.get_matrix('Eqin', backend=backend)
+            m_minMax = self.get_matrix('minmax', backend=backend)
 
             return {'A':m_A, 'b':m_b, 'c':m_c, 'Eqin':m_Eqin, 'MinMax':m_minMax}
 
-    def write_matrices_to_file(self, path, dual=False):
-        '''This function uses the nested function format_string()
-           to turn all available matrices into strings and then
+    def to_model(self):
+        '''This function returns the LP as an immutable LPModel
+           (see Aplos.model), with 'A' in sparse form.
+
+           The model holds no text and no reference to the parser,
+           so the parser can be discarded afterwards. Variables are
+           assumed to be >= 0.
+        '''
+
+        m = self.get_matrices(sparse=True, format='csr')
+        A = m['A']
+
+        return LPModel((A['indptr'], A['indices'], A['data'], A['shape']),
+                       m['b'], m['c'], m['Eqin'], m['MinMax'][0],
+                       self.__var_constr(), self.get_vars())
+
+    def add_constraint(self, text):
+        '''This function adds the constraint `text` (i.e 'x1 + 2x3 <= 9')
+           at the end of the LP and returns its index, which is also
+           its row in 'A'.
+
+           Only the new line is tokenized and validated. The LP must have
+           been checked with detect_errors() first and an LPErrorException
+           is raised if the new line contains errors, in which case the
+           LP is left as it was.
+
+           The dimensions and the cached 'A', 'b', 'c', 'Eqin' & 'MinMax'
+           (dense lists) are updated in place of being rebuilt. Every other
+           cached matrix is computed again when it is next requested.
+           Matrices returned before the edit are never modified.
+        '''
+
+        self.__edit('insert', len(self.lp_lines), text)
+
+        return self.m - 1
+
+    def replace_constraint(self, i, text):
+        '''This function replaces the constraint at index `i` (0-based,
+           its row in 'A') with `text`. It works like add_constraint().
+        '''
+
+        self.__edit('replace', self.__constraint_line(i), text)
+
+    def remove_constraint(self, i):
+        '''This function removes the constraint at index `i` (0-based,
+           its row in 'A'). The constraints after it move up by one.
+           It works like add_constraint().
+        '''
+
+        if len(self.lp_lines) == 2:
+            raise LPErrorException("Can't remove the only constraint of the LP.")
+
+        self.__edit('remove', self.__constraint_line(i))
+
+    def set_objective(self, text):
+        '''This function replaces the objective function of the LP
+           with `text` (i.e 'min 3x1 - x2'). It works like add_constraint().
+        '''
+
+        self.__edit('replace', 0, text)
+
+    def __constraint_line(self, i):
+        '''Returns the index in `lp_lines` of constraint `i`'''
+
+        if not 0 <= i < len(self.lp_lines) - 1:
+            raise IndexError('Constraint index out of range')
+
+        return i + 1
+
+    def __edit(self, action, idx, text=None):
+        '''Inserts, replaces or removes (`action`) the line at `idx`
+           and brings the dimensions, the variable index and the dense
+           matrices of the cache up to date.
+        '''
+
+        if not self.lp_lines:
+            raise EmptyLPException("Given LP is empty. Can't edit it.")
+
+        if not self.error_list and self.constr_end_idx == -1:
+            raise LPErrorException("Given LP may contain errors. Search for errors first.")
+
+        elif self.error_list:
+            raise LPErrorException("Given LP contains errors. Can't edit it.")
+
+        lines = self.lp_lines
+        cache = self.__cache if self.__cache_version == lines.version else {}
+        self.get_dimensions() # Makes sure m, n & the variable index are current
+
+        old_n = self.n
+        old_width = self.__line(idx).width if action != 'insert' else 0
+
+        parsed = None
+        if action != 'remove':
+            line = ''.join(text.split()) # Remove whitespace
+            parsed = self.__parse_text(self.__strip_keywords(0, line) if idx == 0 else line)
+
+            diagnostics = list(self.__objective_errors(line)) if idx == 0 else []
+            diagnostics += self.__line_errors(idx, line, parsed)
+            if diagnostics:
+                raise LPErrorException('Given line contains errors: ' + ' '.join(d.message for d in diagnostics))
+
+        if action == 'insert':
+            lines.insert(idx, line)
+        elif action == 'replace':
+            lines[idx] = line
+        else:
+            del lines[idx]
+
+        # The first constraint has to keep the constraint initializer.
+        # Names can start like one, so with symbols=True it is always added.
+        if self.symbols and idx == 1:
+            lines[1] = 's.t.' + lines[1]
+        elif idx <= 1 and not _has_initializer(lines[1]):
+            lines[1] = 's.t.' + lines[1]
+
+        self.constr_end_idx = len(lines)
+        self.m = len(lines) - 1
+
+        # Any edit can renumber the columns of the symbol table,
+        # so the matrices are built again from the parsed lines
+        if self.symbols:
+            self.__cache = {}
+            self.__cache_version = None
+            self.__vars_version = None
+            self.get_dimensions()
+            return
+
+        # The width of the LP is the largest width with lines left
+        widths = self.__vars['widths']
+        if action != 'insert':
+            widths[old_width] -= 1
+            if not widths[old_width]:
+                del widths[old_width]
+        if parsed:
+            widths[parsed.width] += 1
+
+        self.n = max(widths)
+
+        if self.n != old_n:
+            names = ['x' + str(i) for i in range(1, self.n+1)]
+            self.__vars = {'names':names, 'columns':{name:col for col, name in enumerate(names)}, 'widths':widths}
+        self.__vars_version = lines.version
+
+        self.__cache = {}
+        for name in ['a', 'b', 'c', 'eqin', 'minmax']:
+            key = ('primal', name, False, False, None)
+            if key in cache:
+                self.__cache[key] = self.__edit_matrix(name, cache[key], action, idx, parsed, old_n)
+        self.__cache_version = lines.version
+
+    def __edit_matrix(self, name, matrix, action, idx, parsed, old_n):
+        '''Returns a copy of the cached dense `matrix` with the edit of
+           the line at `idx` applied. Only the rows that changed are
+           built, the rest are shared with the original.
+        '''
+
+        def resize(row):
+            if len(row) < self.n:
+                return row + [0] * (self.n - len(row))
+            return row[:self.n] if len(row) > self.n else row
+
+        if name == 'c':
+            return self.__process_factors(parsed.terms, self.n) if idx == 0 else resize(matrix)
+
+        elif name == 'minmax':
+            return [self.__min_max()] if idx == 0 else matrix
+
+        matrix = list(matrix)
+
+        if idx > 0:
+            row = idx - 1
+
+            if action == 'remove':
+                del matrix[row]
+            else:
+                if name == 'a':
+                    value = self.__process_factors(parsed.terms, self.n)
+                elif name == 'b':
+                    value = parsed.rhs
+                else:
+                    value = _RELATIONS[parsed.relation]
+
+                if action == 'insert':
+                    matrix.insert(row, value)
+                else:
+                    matrix[row] = value
+
+        if name == 'a' and self.n != old_n:
+            matrix = [resize(row) for row in matrix]
+
+        return matrix
+
+    def write_matrices_to_file(self, path, dual=False, format='text'):
+        '''This function uses the nested function format_lines()
+           to turn all available matrices into text and then
            save them to the specified `path`.
 
+           `path` can also be an open file object, text or binary
+           (i.e io.BytesIO or a gzip stream). It is left open.
+
            To save the dual matrices set dual=True.
+
+           With format='binary' the matrices are saved in a compact
+           binary container instead (see Aplos.binary), with 'A' in
+           sparse triplet form. read_matrices_from_file() reads both formats.
         '''
 
-        def format_string(name, matrix):
-            '''format_string() turns the given matrix into a string.
+        def format_lines(name, matrix):
+            '''format_lines() yields the text of the given matrix
+               one element (or row) at a time.
 
                `name` is the name of the given matrix and 
                `matrix` is the matrix itself.
@@ -368,25 +1443,13 @@ class AplosParser:
                `name` is used to label the matrix.
 
                This function is built to work with both 1D and 2D lists/matrices.
+               Rows of 2D matrices are written as lists, i.e '[1, 2]'.
             '''
-            
-            matrix_string = name +'=['
-            if isinstance(matrix, list):
-                for i,el in enumerate(matrix):
-                    if i == len(matrix) - 1:
-                        matrix_string += str(el)
-                    else:
-                        matrix_string += str(el) + '\n'
-            else:
-                for row in matrix:
-                    row_string = ' '.join(str(el) for el in row)
-                    if row == matrix[-1]:
-                        matrix_string += row_string
-                    else:
-                        matrix_string += row_string + '\n'
 
-            matrix_string += ']\n\n'
-            return matrix_string
+            yield name + '=['
+            for i,el in enumerate(matrix):
+                yield ('\n' if i else '') + str(el)
+            yield ']\n\n'
 
         if not self.lp_lines:
             raise EmptyLPException("Given LP is empty. Can't calculate matrices.")
@@ -394,36 +1457,36 @@ class AplosParser:
         if not self.error_list and self.constr_end_idx == -1:
             raise LPErrorException("Given LP may contain errors. Search for errors first.")
         
-        elif self.error_list and self.constr_end_idx != -1:
+        elif self.error_list:
             raise LPErrorException("Given LP contains errors. Can't calculate matrices.")
-        
 
-        with open(path, 'w') as lp2f:
+        if format not in ['text', 'binary']:
+            raise ValueError("Unknown format '{0}'. Use either 'text' or 'binary'.".format(format))
 
-            if dual: m = self.get_dual_matrices()
-            else : m = self.get_matrices()
+        with self.__stage('write_matrices'):
+            if format == 'binary':
+                if dual: m = self.get_dual_matrices(sparse=True)
+                else : m = self.get_matrices(sparse=True)
 
-            A_string = format_string('A', m['A'])
-            lp2f.write(A_string)
+                with open_output(path, binary=True) as lp2f:
+                    write_binary(lp2f, m, dual)
 
-            b_string = format_string('b', m['b'])
-            lp2f.write(b_string)
-            
-            c_string = format_string('c', m['c'])
-            lp2f.write(c_string)
+                return
 
-            eqin_string = format_string('Eqin', m['Eqin'])
-            lp2f.write(eqin_string)
+            if dual: m = self.get_dual_matrices()
+            else : m = self.get_matrices()
 
-            lp2f.write(format_string('MinMax', m['MinMax']))
+            with open_output(path) as lp2f:
+                for name in ['A', 'b', 'c', 'Eqin', 'MinMax']:
+                    lp2f.writelines(format_lines(name, m[name]))
 
-            if dual:
-                constr = {0:'free', 1:'>= 0', -1:'<= 0'}
+                if dual:
+                    constr = {0:'free', 1:'>= 0', -1:'<= 0'}
 
-                for i,el in enumerate(m['VarConstr']):
-                    lp2f.write("w_{0} {1}\n".format(i+1, constr[int(el)]))
-                        
-    def get_dual_matrix(self, matrix=None):
+                    lp2f.writelines("w_{0} {1}\n".format(i+1, constr[int(el)])
+                                    for i,el in enumerate(m['VarConstr']))
+
+    def get_dual_matrix(self, matrix=None, sparse=False, format='coo', backend='list'):
         '''This function calculates and returns the specified matrix
            of the dual form of the LP.
 
@@ -431,10 +1494,24 @@ class AplosParser:
             * A gets transposed
             * b & c get swapped
             * min becomes max
-            * from min to max, if x(i)>=0 : constraint(i)<=0 and vice versa
-            * if constraint(i) is '='  : w(i) is 'free'
-              if constraint(i) is '>=' : w(i) is '>= 0'
-              if constraint(i) is '<=' : w(i) is '<= 0'
+            * for a max LP, x(j) >= 0 : constraint(j) is '>='
+                            x(j) <= 0 : constraint(j) is '<='
+              for a min LP it's the other way around,
+              and if x(j) is free   : constraint(j) is '='
+            * for a max LP, constraint(i) '<=' : w(i) is '>= 0'
+                            constraint(i) '>=' : w(i) is '<= 0'
+              for a min LP it's the other way around,
+              and if constraint(i) is '=' : w(i) is 'free'
+
+           Every dual matrix is built straight from the parsed lines,
+           without building the primal matrices first.
+
+           If sparse=True, 'A' is returned in sparse form. With format='csr'
+           the rows of the dual 'A' are the columns of the primal one, so it
+           doubles as the primal 'A' in compressed column (CSC) form.
+
+           With backend='numpy' an ndarray is returned. The dual 'A'
+           is then a read-only, transposed view of the primal 'A', not a copy.
         '''
 
         if not matrix:
@@ -447,183 +1524,226 @@ class AplosParser:
         if not self.error_list and self.constr_end_idx == -1:
             raise LPErrorException("Given LP may contain errors. Search for errors first.")
         
-        elif self.error_list and self.constr_end_idx != -1:
+        elif self.error_list:
             raise LPErrorException("Given LP contains errors. Can't calculate matrices.")
        
         else:
+            np = _import_numpy(backend)
+            if sparse: np = None
+
+            return _copy(self.__dual_matrix(matrix, sparse, format, np))
+
+    def __dual_matrix(self, matrix, sparse=False, format='coo', np=None):
+        '''Returns the dual `matrix` from the cache, building it on a miss.
+           The matrix is shared with the cache and must not be modified.
+        '''
+
+        return self.__cached(('dual', matrix.lower(), sparse and format, bool(np)),
+                             lambda: self.__build_dual_matrix(matrix, sparse, format, np))
+
+    def __min_max(self):
+        '''Returns 1 if the LP is a max problem and -1 if it is a min one'''
+
+        objective = self.lp_lines[0].lower()
+        if self.symbols:
+            objective = objective[:3]
 
+        return -1 if 'min' in objective else 1
+
+    def __var_constr(self):
+        '''Returns the constraints of the primal variables
+           ('free' : 0 | '>= 0' : 1 | '<= 0' : -1).
+
+           The LP format has no variable constraints yet,
+           so every variable is >= 0.
+        '''
+
+        return [1] * self.n
+
+    def __build_dual_matrix(self, matrix, sparse, format, np=None):
+        '''Computes the given matrix for get_dual_matrix(). Results are cached.
+
+           If the numpy module is given as `np` an ndarray is returned
+           instead of a list.
+        '''
+
+        # Make sure m & n are assigned to the parser object
+        if not self.m or not self.n : self.get_dimensions()
+
+        if sparse and matrix.lower() != 'a':
+            raise ValueError("Only matrix 'A' can be returned in sparse form.")
+
+        if np:
             if matrix.lower() == 'a':
-                return [list(i) for i in zip(*self.get_matrix('A'))]
-            
+                return self.__matrix('a', np=np).T
+
             elif matrix.lower() == 'b':
-                return self.get_matrix('c')
+                return self.__matrix('c', np=np)
             elif matrix.lower() == 'c':
-                return self.get_matrix('b')
-            
-            elif matrix.lower() == 'minmax':
-                if self.get_matrix('minmax') == [1] : return [-1]
-                else: return [1]
+                return self.__matrix('b', np=np)
 
-            elif matrix.lower() == 'eqin':
-                # Build Eqin assuming that x(i) >= 0 for every i
-                if self.get_matrix('minmax')[0] == '-1':
-                    # Every constraint will be <=
-                    base_str = '-1, ' * len(self.get_matrix('a')[0])
+            elif matrix.lower() in ['minmax', 'eqin', 'var_constr']:
+                return np.array(self.__dual_matrix(matrix), dtype=np.int64)
 
-                    # [:-2] -> We ignore the last element since it will 
-                    # always be empty due to the way base_str is built
-                    new_eqin = base_str[:-2].split(',') 
-                    new_eqin = [int(i) for i in new_eqin]
+        elif matrix.lower() == 'a' and sparse:
+            if format not in SPARSE_FORMATS:
+                raise ValueError("Unknown sparse format '{0}'. Use one of: {1}".format(format, ', '.join(SPARSE_FORMATS)))
 
-                else:
-                    # Every constraint will be >=
-                    base_str = '1, ' * len(self.get_matrix('a')[0])
-                    new_eqin = base_str[:-2].split(',') 
-                    new_eqin = [int(i) for i in new_eqin]
+            # The triplets of the primal 'A' with their row & column swapped
+            primal = self.__matrix('a', True, 'coo')
+            if format == 'coo':
+                return {'row':primal['col'], 'col':primal['row'], 'data':primal['data'], 'shape':(self.n, self.m)}
 
-                return new_eqin
-            
-            elif matrix.lower() == 'var_constr':
-                # Find new variable restrictions
-                var_constr = []
-                if self.get_matrix('minmax')[0] == '1':
-                    for constr in self.get_matrix('eqin'): # For every constraint
-                        if constr == '0':
-                            var_constr.append('0')
-                        elif constr == '-1':
-                            var_constr.append('1')
-                        else:
-                            var_constr.append('-1')
-                else:
-                    for constr in self.get_matrix('eqin'):
-                        if constr == '0':
-                            var_constr.append('0')
-                        elif constr == '-1':
-                            var_constr.append('-1')
-                        else:
-                            var_constr.append('1')
+            primal = self.__matrix('a', True, 'csr')
+            A = transpose(CSRMatrix(primal['indptr'], primal['indices'], primal['data'], primal['shape']))
 
-                return [int(i) for i in var_constr]
+            return A._asdict()
 
-    def get_dual_matrices(self):
+        elif matrix.lower() == 'a':
+            # Every term of constraint i goes to row 'column' of the dual
+            A = [[0] * self.m for _ in range(self.n)]
+            for i in range(self.m):
+                for number, fac_pos in self.__line(i+1).terms:
+                    A[fac_pos][i] = number
+
+            return A
+
+        elif matrix.lower() == 'b':
+            return self.__process_factors(self.__line(0).terms, self.n)
+
+        elif matrix.lower() == 'c':
+            return [self.__line(i+1).rhs for i in range(self.m)]
+
+        elif matrix.lower() == 'minmax':
+            return [-self.__min_max()]
+
+        # Both rules map a value to itself for max and to its opposite for min
+        elif matrix.lower() == 'eqin':
+            min_max = self.__min_max()
+            return [min_max * constr for constr in self.__var_constr()]
+
+        elif matrix.lower() == 'var_constr':
+            min_max = self.__min_max()
+            return [-min_max * _RELATIONS[self.__line(i+1).relation] for i in range(self.m)]
+
+    def get_dual_matrices(self, sparse=False, format='coo', backend='list'):
         '''This function works the same way as get_matrices().
            Similarly, it returns all the dual matrices in a dict.
         '''
 
-        d_A = self.get_dual_matrix('a')
-        d_b = self.get_dual_matrix('b')
-        d_c = self.get_dual_matrix('c')
-        d_Eqin = self.get_dual_matrix('Eqin')
-        d_minMax = self.get_dual_matrix('minmax')
-        d_var_cons = self.get_dual_matrix('var_constr')
+        d_A = self.get_dual_matrix('a', sparse=sparse, format=format, backend=backend)
+        d_b = self.get_dual_matrix('b', backend=backend)
+        d_c = self.get_dual_matrix('c', backend=backend)
+        d_Eqin = self.get_dual_matrix('Eqin', backend=backend)
+        d_minMax = self.get_dual_matrix('minmax', backend=backend)
+        d_var_cons = self.get_dual_matrix('var_constr', backend=backend)
 
 
         return {'A':d_A, 'b':d_b, 'c':d_c, 'Eqin':d_Eqin, 'MinMax':d_minMax, 'VarConstr': d_var_cons}
 
     def read_matrices_from_file(self, path, dual=False):
-        def extract_one_dim_matrix(regex, matrix):
-            """This inner function returns a 1D matrix read from the specified
-               path.
-
-               It uses a unique regex for every matrix to get a string which
-               contains the matrix in raw form. 
-               
-               Then, to get only the contents of
-               the matrix, it finds the first (min) possible break points (next_x)
-               and if the current element in the loop is a number it appends it to the
-               matrix - which will then be returned.
+        '''This function reads back the matrices saved by
+           write_matrices_to_file() and returns them in a dict.
+
+           To read dual matrices (which include 'VarConstr') set dual=True.
+
+           The file is memory-mapped and scanned once from start to end.
+           Each of the 'A=[', 'b=[', 'c=[', 'Eqin=[' and 'MinMax=[' blocks
+           is located right after the previous one and its numbers are
+           split and converted in bulk.
+
+           Files saved with format='binary' are detected automatically and
+           loaded without copying: every matrix is then a memoryview over the
+           mapped file and 'A' is in sparse 'coo' form.
+        '''
+
+        with self.__stage('read_matrices'):
+            return self.__read_matrices(path, dual)
+
+    def __read_matrices(self, path, dual):
+        '''Reads the matrices for read_matrices_from_file()'''
+
+        def find_block(start_tag, end_tag, pos):
+            """This inner function finds the block that begins with
+               `start_tag` at or after `pos` and ends with `end_tag`.
+
+               It returns the contents of the block (without the tags)
+               and the position right after it.
             """
 
-            factor_string = r.findall(regex, text, flags=r.S)
-            if not factor_string:
+            start = data.find(start_tag, pos)
+            if start == -1:
                 raise LPReadException ("Aplos couldn't read the matrices correctly.")
+            start += len(start_tag)
 
-            factor_string = factor_string[0]
-
-            i = 0
-            while i < len(factor_string):
-                char = factor_string[i]
-                next_newline = factor_string.find('\n', i)
-                next_bracket = factor_string.find(']', i)
+            end = data.find(end_tag, start)
+            if end == -1:
+                raise LPReadException ("Aplos couldn't read the matrices correctly.")
 
-                end_of_el = min(next_bracket, next_newline) - 1
+            return data[start:end], end + len(end_tag)
 
-                if char == '-' or char.isdigit(): # If char is number
-                    matrix.append(int(factor_string[i:end_of_el + 1]))
-                    i = end_of_el + 1
-                
-                i += 1
-        
-        def read_file(path):
-            with open(path, 'r') as lp_file:
-                return lp_file.read()
-        
+        def to_numbers(tokens):
+            try:
+                return list(map(_to_number, tokens))
+            except ValueError:
+                raise LPReadException ("Aplos couldn't read the matrices correctly.")
 
-        text = read_file(path)
-
-        # Extract 'A' matrix
-        # The code here is almost exactly the same
-        # as extract_one_dim_matrix() but the differences were enough
-        # to not make it an extra case in the function.
-        factor_string = r.findall(r'A=.*?\]\]\n', text, flags=r.S)
-        if not factor_string:
-            raise LPReadException ("Aplos couldn't read the matrices correctly.")
-        factor_string = factor_string[0]
-
-        row_amount = factor_string.count('\n')
-        A = [[] for _ in range(row_amount)] # Initialize with appropriate rows
-        cur_row = 0
-        i = 0
-        while i < len(factor_string):
-            char = factor_string[i]
-            next_comma = factor_string.find(',', i)
-            next_bracket = factor_string.find(']', i)
-            next_space = factor_string.find(' ', i)
-
-            end_of_el = min(next_comma, next_bracket) - 1
-            if end_of_el < 0 : end_of_el = next_bracket - 1
-
-            if char == '-' or char.isdigit(): # If char is number (neg/pos)
-                A[cur_row].append(int(factor_string[i:end_of_el + 1]))
-
-                if next_space == -1: # If there aren't any more spaces
-                    break
+        if detect_compression(path):
+            # Compressed files can't be mapped,
+            # they are decompressed in memory instead
+            with open_input(path, binary=True) as lp_file:
+                data = lp_file.read()
+        else:
+            with open(path, 'rb') as lp_file:
+                try:
+                    data = mmap.mmap(lp_file.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError: # Empty files can't be mapped
+                    raise LPReadException ("Aplos couldn't read the matrices correctly.")
+
+        # The binary loader keeps the file mapped, since
+        # the matrices it returns are views over it
+        if is_binary(data):
+            return read_binary(data, dual)
+
+        try:
+            # Extract 'A' matrix
+            # Rows are written one per line, as '[1, 2]'
+            block, pos = find_block(b'A=[', b']]\n', 0)
+            A = [to_numbers(row.strip(b'[]').split(b',')) for row in block.split(b'\n')]
+
+            # Find b, c & Eqin matrices
+            # Their elements are written one per line
+            block, pos = find_block(b'b=[', b']\n', pos)
+            b = to_numbers(block.split())
+
+            block, pos = find_block(b'c=[', b']\n', pos)
+            c = to_numbers(block.split())
+
+            block, pos = find_block(b'Eqin=[', b']\n', pos)
+            eqin = to_numbers(block.split())
+
+            # Find MinMax
+            block, pos = find_block(b'MinMax=[', b']', pos)
+            min_max = to_numbers(block.split())
+
+            # Find variable constraints
+            var_constr = []
+            for con in data[pos:].split(b'\n'):
+                if not con.startswith(b'w_'):
+                    continue
+
+                if b'>=' in con:
+                    var_constr.append(1)
+                elif b'<=' in con:
+                    var_constr.append(-1)
                 else:
-                    i = min(next_space, next_bracket) # In case this is the last element - so we don't skip elements
-            
-            elif char =='\n':
-                cur_row += 1
-
-            i += 1
-
-        # Find b matrix
-        b = []
-        extract_one_dim_matrix(r'b=.*?\]\n', b)
-
-        # Find c matrix
-        c = []
-        extract_one_dim_matrix(r'c=.*?\]\n', c)
-
-        # Find Eqin matrix
-        eqin = []
-        extract_one_dim_matrix(r'Eqin=.*?\]\n', eqin)
-
-        # Find MinMax
-        min_max = r.findall(r'(?<=MinMax=\[)[-+]?\d', text)
-        min_max[0] = int(min_max[0])
-
-        # Find variable constraints
-        constraints = r.findall(r'(?<=w\_).*?\n', text)
-        var_constr = []
-        for con in constraints:
-            if '>=' in con:
-                var_constr.append(1)
-            elif '<=' in con:
-                var_constr.append(-1)
-            else:
-                var_constr.append(0)
+                    var_constr.append(0)
+
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
 
         if dual:
             return{'A' : A, 'b' : b, 'c' : c, 'Eqin' : eqin, 'MinMax' : min_max, 'VarConstr':var_constr} 
         else:
-            return{'A' : A, 'b' : b, 'c' : c, 'Eqin' : eqin, 'MinMax' : min_max}
\ No newline at end of file
+            return{'A' : A, 'b' : b, 'c' : c, 'Eqin' : eqin, 'MinMax' : min_max}
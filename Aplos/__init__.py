@@ -1,2 +1,10 @@
+__version__ = '1.1'
+
 from Aplos.AplosParser import AplosParser
-from Aplos.exceptions import *
\ No newline at end of file
+from Aplos.batch import parse_file, parse_many
+from Aplos.cache import ParseCache
+from Aplos.diagnostics import Diagnostic
+from Aplos.model import LPModel
+from Aplos.sparse import to_scipy
+from Aplos.stats import ParserStats
+from Aplos.exceptions import *
@@ -0,0 +1,90 @@
+# coding=utf-8
+
+from .AplosParser import AplosParser
+import warnings
+
+def parse_file(path, dual=False, cache=None):
+    '''Runs the usual AplosParser pipeline on a single LP file and
+       returns a dict with the outcome:
+
+        errors    -- the list returned by detect_errors()
+        matrices  -- the dict returned by get_matrices() (or get_dual_matrices()
+                     if dual=True), None if the LP contains errors
+        exception -- the exception raised while parsing (i.e IOError,
+                     EmptyLPException), None if there wasn't any
+
+       Warnings are silenced, since the errors are part of the result.
+
+       If a ParseCache is given as `cache`, unchanged files are not parsed
+       again: their errors and matrices are loaded from the cache instead.
+       Results that hold an exception are never cached.
+    '''
+
+    result = {'errors':[], 'matrices':None, 'exception':None}
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+
+        try:
+            key = None
+            if cache:
+                key = cache.key(path, dual)
+                cached = cache.get(key, dual)
+                if cached:
+                    result.update(cached)
+                    return result
+
+            parser = AplosParser(filename=path)
+            result['errors'] = parser.detect_errors()
+
+            if not result['errors']:
+                if dual: result['matrices'] = parser.get_dual_matrices()
+                else: result['matrices'] = parser.get_matrices()
+
+            if key:
+                cache.put(key, result['errors'], result['matrices'], dual)
+
+        except Exception as e:
+            result['exception'] = e
+
+    return result
+
+def _parse_chunk(paths, dual, cache):
+    '''Parses a chunk of files inside a worker process'''
+
+    return [(path, parse_file(path, dual, cache)) for path in paths]
+
+def parse_many(paths, workers=None, chunksize=1, dual=False, cache=None):
+    '''This function parses many LP files across `workers` processes
+       (defaults to the number of CPUs) and yields a (path, result)
+       tuple for each file as soon as it has been parsed.
+
+       `result` is the dict returned by parse_file(), so the results
+       are identical to parsing the files one by one.
+
+       Files are sent to the workers in chunks of `chunksize` paths,
+       which amortizes the pickling overhead when parsing many small
+       files. With workers=1 the files are parsed in the current process.
+
+       `cache` is passed on to parse_file() and is shared by every worker.
+    '''
+
+    paths = list(paths)
+
+    if workers == 1:
+        for path in paths:
+            yield path, parse_file(path, dual, cache)
+        return
+
+    # Imported here since it pulls in multiprocessing,
+    # which slows down 'import Aplos' considerably
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    chunks = [paths[i:i+chunksize] for i in range(0, len(paths), chunksize)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_parse_chunk, chunk, dual, cache) for chunk in chunks]
+
+        for future in as_completed(futures):
+            for path, result in future.result():
+                yield path, result
@@ -0,0 +1,115 @@
+# coding=utf-8
+
+from .exceptions import LPReadException
+from .sparse import build_sparse, typecode_for, FLOAT_TYPECODE
+from array import array
+import struct
+import sys
+
+# Binary matrix container
+#
+#   header  -- MAGIC, format version, flags and the length of every array
+#   arrays  -- A in sparse triplet form (row, col, data), followed by
+#              b, c, Eqin, MinMax and VarConstr
+#
+# Every number is a little-endian signed 64-bit integer, except for the
+# data of A, b and c which are little-endian doubles if FLAG_FLOAT is set.
+# The header is 80 bytes long, so every array starts on an 8-byte boundary.
+MAGIC = b'APLOSBIN'
+VERSION = 1
+FLAG_DUAL = 1
+FLAG_FLOAT = 2
+
+HEADER = struct.Struct('<8sHHI8q')
+ITEM_SIZE = 8
+
+_VECTORS = ('b', 'c', 'Eqin', 'MinMax', 'VarConstr')
+
+# The arrays stored as doubles when FLAG_FLOAT is set
+_FLOAT_ARRAYS = (2, 3, 4) # A's data, b & c
+
+def _to_bytes(values, typecode='q'):
+    '''Returns the little-endian bytes of the given numbers'''
+
+    values = array(typecode, values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+
+    return values.tobytes()
+
+def write_binary(bin_file, matrices, dual=False):
+    '''Writes the given matrices to the binary file object `bin_file`.
+
+       'A' can either be a dense list of lists or a sparse 'coo'
+       matrix as returned by get_matrix('A', sparse=True).
+    '''
+
+    A = matrices['A']
+    if isinstance(A, list):
+        m, n = len(A), len(A[0]) if A else 0
+        A = build_sparse(([(el, col) for col, el in enumerate(row)] for row in A), (m, n))
+
+    vectors = [matrices.get(name, []) for name in _VECTORS]
+
+    arrays = [A['row'], A['col'], A['data']] + vectors
+    is_float = any(typecode_for(arrays[i]) == FLOAT_TYPECODE for i in _FLOAT_ARRAYS)
+
+    flags = FLAG_DUAL if dual else 0
+    if is_float: flags |= FLAG_FLOAT
+
+    m, n = A['shape']
+    bin_file.write(HEADER.pack(MAGIC, VERSION, flags, 0, m, n, len(A['data']), *[len(v) for v in vectors]))
+
+    for i, values in enumerate(arrays):
+        bin_file.write(_to_bytes(values, 'd' if is_float and i in _FLOAT_ARRAYS else 'q'))
+
+def is_binary(data):
+    '''Returns True if `data` (bytes, mmap, ...) starts with the binary container's magic'''
+
+    return data[:len(MAGIC)] == MAGIC
+
+def read_binary(data, dual=False):
+    '''Loads the matrices from `data`, a bytes-like object holding a
+       binary container (usually a read-only mmap of the file).
+
+       Every array is returned as a memoryview of 64-bit integers
+       (or doubles, see FLAG_FLOAT) over `data` itself, so nothing is copied. 'A' is returned in
+       sparse 'coo' form (see Aplos.sparse.build_sparse).
+
+       'VarConstr' is only included if dual=True.
+    '''
+
+    if len(data) < HEADER.size:
+        raise LPReadException ("Aplos couldn't read the matrices correctly.")
+
+    magic, version, flags, _, m, n, nnz, *lengths = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise LPReadException ("Aplos couldn't read the matrices correctly.")
+
+    view = memoryview(data)
+    arrays = []
+    pos = HEADER.size
+    for i, length in enumerate([nnz, nnz, nnz] + lengths):
+        end = pos + length * ITEM_SIZE
+        if end > len(data):
+            raise LPReadException ("Aplos couldn't read the matrices correctly.")
+
+        typecode = 'd' if flags & FLAG_FLOAT and i in _FLOAT_ARRAYS else 'q'
+        if sys.byteorder == 'little':
+            arrays.append(view[pos:end].cast(typecode))
+        else:
+            # Big-endian machines need a byte-swapped copy
+            values = array(typecode, view[pos:end].tobytes())
+            values.byteswap()
+            arrays.append(memoryview(values))
+
+        pos = end
+
+    row, col, values = arrays[:3]
+    matrices = {'A':{'row':row, 'col':col, 'data':values, 'shape':(m, n)}}
+    matrices.update(zip(_VECTORS, arrays[3:]))
+
+    if not dual:
+        del matrices['VarConstr']
+
+    return matrices
@@ -0,0 +1,283 @@
+# coding=utf-8
+
+from .binary import write_binary, read_binary
+from .exceptions import LPReadException
+from .sparse import build_sparse
+import base64
+import io
+import os
+
+# Bump whenever a change of the parser or of the stored
+# format makes the existing cache entries invalid
+CACHE_VERSION = 2
+
+# Setting this environment variable changes the default cache directory
+CACHE_DIR_ENV_VAR = 'APLOS_CACHE_DIR'
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024 # 256 MiB
+
+# Once the cache outgrows max_size, entries are evicted until
+# it is down to this fraction of it, so evictions come in batches
+LOW_WATER_MARK = 0.9
+
+def default_directory():
+    '''Returns the directory used when ParseCache isn't given one:
+       $APLOS_CACHE_DIR, or 'aplos' under $XDG_CACHE_HOME (~/.cache).
+    '''
+
+    directory = os.environ.get(CACHE_DIR_ENV_VAR)
+    if directory:
+        return directory
+
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'aplos')
+
+# The matrices that can hold both ints and floats
+_NUMBERS = ('A', 'b', 'c')
+
+def _dense(A, data):
+    '''Returns the sparse 'coo' matrix `A`, with the values `data`,
+       as a dense list of lists
+    '''
+
+    m, n = A['shape']
+    dense = [[0] * n for _ in range(m)]
+    for i, j, value in zip(A['row'].tolist(), A['col'].tolist(), data):
+        dense[i][j] = value
+
+    return dense
+
+def _int_mask(values):
+    '''Returns a base64 bitmask with the bit of every int of `values` set'''
+
+    mask = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if not isinstance(value, float):
+            mask[i >> 3] |= 1 << (i & 7)
+
+    return base64.b64encode(bytes(mask)).decode('ascii')
+
+def _apply_mask(values, mask):
+    '''Turns the values of `values` that have their bit set in the
+       base64 bitmask `mask` back into ints
+    '''
+
+    mask = base64.b64decode(mask)
+    return [int(value) if mask[i >> 3] >> (i & 7) & 1 else value for i, value in enumerate(values)]
+
+class ParseCache:
+    '''A persistent, size-bounded cache of parse results on disk.
+
+       Entries are keyed by a hash of the contents of the LP file, the
+       Aplos version and CACHE_VERSION, so a file is only parsed again if
+       it has changed or Aplos has been upgraded. Every entry consists of:
+
+        <key>.json -- the error list of the LP
+        <key>.bin  -- its matrices in the binary container (see Aplos.binary),
+                      only if the LP has no errors
+
+       The binary container stores every number of 'A', 'b' & 'c' as a double
+       once any of them is a float. For such LPs <key>.json also marks which
+       numbers were ints, so hits return them exactly as parsing does.
+
+       Once the total size of the entries exceeds `max_size` bytes the least
+       recently used ones are removed, down to LOW_WATER_MARK * max_size.
+       Usage is tracked by the modification time of the entries, so the
+       cache can be shared by many processes.
+
+       The directory is only scanned by the first put() and once the size,
+       kept up to date by every put(), crosses `max_size`. Entries written
+       meanwhile by other processes are only counted by the next scan.
+
+       It is used through parse_file(path, cache=...) and parse_many(paths, cache=...).
+    '''
+
+    def __init__(self, directory=None, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory or default_directory()
+        self.max_size = max_size
+        self.__size = None # Unknown until the directory is scanned
+
+    def key(self, path, dual=False):
+        '''Returns the cache key of the LP file at `path`'''
+
+        import hashlib
+        from . import __version__
+
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update('{0}:{1}:{2}:'.format(__version__, CACHE_VERSION, int(bool(dual))).encode())
+
+        with open(path, 'rb') as lp_file:
+            for block in iter(lambda: lp_file.read(1 << 20), b''):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    def __path(self, key, extension):
+        return os.path.join(self.directory, key + extension)
+
+    def get(self, key, dual=False):
+        '''Returns the cached {'errors', 'matrices'} of `key`,
+           or None if it isn't cached.
+
+           The matrices are returned exactly like get_matrices()
+           (or get_dual_matrices() if dual=True) returns them.
+        '''
+
+        import json
+
+        try:
+            with open(self.__path(key, '.json'), 'rb') as meta_file:
+                meta = json.loads(meta_file.read().decode('utf-8'))
+                errors = meta['errors']
+
+            matrices = None
+            if not errors:
+                with open(self.__path(key, '.bin'), 'rb') as bin_file:
+                    matrices = read_binary(bin_file.read(), dual)
+
+        except (OSError, ValueError, KeyError, LPReadException):
+            # Missing, evicted meanwhile or corrupted
+            return None
+
+        self.__touch(key)
+
+        if matrices is not None:
+            A = matrices.pop('A')
+            matrices = {name:values.tolist() for name, values in matrices.items()}
+            matrices['A'] = A['data'].tolist()
+
+            for name, mask in meta.get('ints', {}).items():
+                matrices[name] = _apply_mask(matrices[name], mask)
+
+            matrices['A'] = _dense(A, matrices['A'])
+
+        return {'errors':errors, 'matrices':matrices}
+
+    def put(self, key, errors, matrices=None, dual=False):
+        '''Stores the `errors` and, if there are none, the `matrices`
+           of an LP under `key`. Least recently used entries are then
+           evicted if the cache has grown larger than `max_size`.
+        '''
+
+        import json
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        meta = {'errors':errors}
+        written = 0
+
+        # The matrices are written before the error list,
+        # which marks the entry as complete
+        if not errors:
+            A = matrices['A']
+            shape = len(A), len(A[0]) if A else 0
+            A = build_sparse(([(el, col) for col, el in enumerate(row)] for row in A), shape, typecode=None)
+
+            numbers = {'A':A['data'], 'b':matrices['b'], 'c':matrices['c']}
+            if any(isinstance(value, float) for name in _NUMBERS for value in numbers[name]):
+                meta['ints'] = {name:_int_mask(numbers[name]) for name in _NUMBERS}
+
+            buffer = io.BytesIO()
+            write_binary(buffer, dict(matrices, A=A), dual)
+            written = self.__write(self.__path(key, '.bin'), buffer.getvalue())
+
+        written += self.__write(self.__path(key, '.json'), json.dumps(meta).encode('utf-8'))
+
+        if self.__size is not None:
+            self.__size += written
+
+        if self.__size is None or self.__size > self.max_size:
+            self.evict()
+
+    def __write(self, path, data):
+        '''Writes `data` to `path` atomically, so concurrent
+           readers never see a partially written file.
+
+           Returns by how many bytes the cache grew.
+        '''
+
+        try:
+            replaced = os.stat(path).st_size
+        except OSError:
+            replaced = 0
+
+        tmp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'wb') as out_file:
+            out_file.write(data)
+
+        os.replace(tmp_path, path)
+
+        return len(data) - replaced
+
+    def __touch(self, key):
+        for extension in ['.json', '.bin']:
+            try:
+                os.utime(self.__path(key, extension))
+            except OSError:
+                pass
+
+    def __entries(self):
+        '''Returns {key: [last use, size]} for every entry of the cache'''
+
+        entries = {}
+        try:
+            files = list(os.scandir(self.directory))
+        except OSError:
+            return entries
+
+        for entry in files:
+            key, extension = os.path.splitext(entry.name)
+            if extension not in ['.json', '.bin']:
+                continue
+
+            try:
+                stat = entry.stat()
+            except OSError: # Removed meanwhile
+                continue
+
+            used_size = entries.setdefault(key, [0, 0])
+            used_size[0] = max(used_size[0], stat.st_mtime)
+            used_size[1] += stat.st_size
+
+        return entries
+
+    def size(self):
+        '''Returns the total size of the cache in bytes'''
+
+        self.__size = sum(size for _, size in self.__entries().values())
+
+        return self.__size
+
+    def evict(self):
+        '''Scans the cache and, if it is larger than `max_size`, removes
+           the least recently used entries until it is no larger than
+           LOW_WATER_MARK * max_size.
+        '''
+
+        entries = self.__entries()
+        total = sum(size for _, size in entries.values())
+
+        if total > self.max_size:
+            for key, (_, size) in sorted(entries.items(), key=lambda entry: entry[1][0]):
+                if total <= self.max_size * LOW_WATER_MARK:
+                    break
+
+                self.__remove(key)
+                total -= size
+
+        self.__size = total
+
+    def __remove(self, key):
+        for extension in ['.json', '.bin']:
+            try:
+                os.remove(self.__path(key, extension))
+            except OSError:
+                pass
+
+    def clear(self):
+        '''Removes every entry of the cache'''
+
+        for key in self.__entries():
+            self.__remove(key)
+
+        self.__size = 0
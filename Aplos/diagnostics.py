@@ -0,0 +1,50 @@
+# coding=utf-8
+
+# Error codes reported by AplosParser.detect_errors(), in the order
+# their messages appear in the parser's error_list, and their messages.
+MINMAX_MISSING = 'minmax-missing'
+MINMAX_AMBIGUOUS = 'minmax-ambiguous'
+ST_MISSING = 'st-missing'
+END_MISSING = 'end-missing'
+TYPE_MISSING = 'type-missing'
+RHS_MISSING = 'rhs-missing'
+SIGN_MISSING = 'sign-missing'
+
+MESSAGES = {
+    MINMAX_MISSING : 'Min/Max is not specified for object function',
+    MINMAX_AMBIGUOUS : 'Optimization way is ambiguous. Use either min or max.',
+    ST_MISSING : "Constraint initializer 's.t' or similar is missing",
+    END_MISSING : 'No END statement found',
+    TYPE_MISSING : 'Constraint type missing from some constraints',
+    RHS_MISSING : 'Right side argument missing from some constraints',
+    SIGN_MISSING : 'Sign missing from some factors',
+}
+
+CODES = (MINMAX_MISSING, MINMAX_AMBIGUOUS, ST_MISSING, END_MISSING, TYPE_MISSING, RHS_MISSING, SIGN_MISSING)
+
+class Diagnostic:
+    '''A single problem found in an LP by detect_errors().
+
+       code    -- one of the error codes above, i.e 'rhs-missing'
+       line    -- the index of the offending line in `lp_lines`
+       column  -- the position of the problem in that line (whitespace
+                  removed), None if it doesn't refer to a specific position
+       message -- the human readable message, as found in error_list
+    '''
+
+    __slots__ = ('code', 'line', 'column', 'message')
+
+    def __init__(self, code, line, column=None):
+        self.code = code
+        self.line = line
+        self.column = column
+        self.message = MESSAGES[code]
+
+    def as_dict(self):
+        return {'code':self.code, 'line':self.line, 'column':self.column, 'message':self.message}
+
+    def __eq__(self, other):
+        return isinstance(other, Diagnostic) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        return 'Diagnostic({0!r}, line={1}, column={2})'.format(self.code, self.line, self.column)
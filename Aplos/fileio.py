@@ -0,0 +1,122 @@
+# coding=utf-8
+
+from contextlib import contextmanager
+import io
+import os
+
+# Supported compressions, detected by their magic bytes when
+# reading and by the file extension when writing.
+MAGIC_BYTES = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+)
+
+EXTENSIONS = {
+    '.gz':'gzip',
+    '.gzip':'gzip',
+    '.bz2':'bz2',
+    '.xz':'xz',
+    '.lzma':'xz',
+    '.zst':'zstd',
+    '.zstd':'zstd',
+}
+
+def compression_from_extension(path):
+    '''Returns the compression implied by the extension of `path`, or None'''
+
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+def detect_compression(path):
+    '''Returns the compression of the file at `path` ('gzip', 'bz2',
+       'xz' or 'zstd') judging by its first bytes, or None if the
+       file isn't compressed.
+    '''
+
+    with open(path, 'rb') as in_file:
+        head = in_file.read(6)
+
+    for magic, compression in MAGIC_BYTES:
+        if head.startswith(magic):
+            return compression
+
+    return None
+
+def open_compressed(path, compression, mode):
+    '''Opens `path` with the module of the given compression.
+       Decompression and compression are streamed, so the uncompressed
+       data is never written to disk.
+
+       zstd is only available if the 'zstandard' package is installed.
+    '''
+
+    if compression == 'gzip':
+        import gzip
+        return gzip.open(path, mode)
+
+    elif compression == 'bz2':
+        import bz2
+        return bz2.open(path, mode)
+
+    elif compression == 'xz':
+        import lzma
+        return lzma.open(path, mode)
+
+    elif compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading or writing zstd files requires the 'zstandard' package")
+
+        return zstandard.open(path, mode)
+
+    return open(path, mode)
+
+def open_input(path, binary=False):
+    '''Opens the file at `path` for reading, decompressing it
+       on the fly if it is compressed.
+    '''
+
+    return open_compressed(path, detect_compression(path), 'rb' if binary else 'rt')
+
+def is_file(target):
+    '''Returns True if `target` is a file object rather than a path'''
+
+    return hasattr(target, 'write') or hasattr(target, 'read')
+
+@contextmanager
+def open_output(target, binary=False):
+    '''Opens `target` for writing and yields the file object to write to.
+
+       `target` can either be a path or an open file object. Binary file
+       objects (i.e io.BytesIO, gzip.GzipFile) are wrapped to accept text
+       when binary=False. File objects are flushed but never closed.
+
+       Paths ending in a compression extension (see EXTENSIONS) are
+       compressed on the fly.
+    '''
+
+    if not is_file(target):
+        mode = 'wb' if binary else 'wt'
+        with open_compressed(target, compression_from_extension(target), mode) as out_file:
+            yield out_file
+        return
+
+    is_text = isinstance(target, io.TextIOBase)
+
+    if binary and is_text:
+        raise ValueError("Binary output needs a binary file object, not a text one.")
+
+    if binary or is_text:
+        yield target
+        target.flush()
+        return
+
+    # Text output to a binary file object
+    wrapper = io.TextIOWrapper(target, encoding='utf-8', newline='\n')
+    try:
+        yield wrapper
+        wrapper.flush()
+    finally:
+        wrapper.detach() # Leave the file object open
@@ -0,0 +1,158 @@
+# coding=utf-8
+
+from .sparse import INDEX_TYPECODE, VALUE_TYPECODE, typecode_for
+from collections import namedtuple
+from array import array
+
+# Sparse matrix in compressed row form, with the same fields
+# as get_matrix('A', sparse=True, format='csr')
+CSRMatrix = namedtuple('CSRMatrix', ['indptr', 'indices', 'data', 'shape'])
+
+def transpose(A):
+    '''Returns the transpose of the CSRMatrix `A`, also as a CSRMatrix.
+
+       It is a counting sort of the elements by column, so it
+       runs in O(m + n + nnz).
+    '''
+
+    m, n = A.shape
+
+    # Count the elements of every column
+    indptr = array(INDEX_TYPECODE, [0]) * (n + 1)
+    for col in A.indices:
+        indptr[col + 1] += 1
+    for j in range(n):
+        indptr[j + 1] += indptr[j]
+
+    # Place every element in its row of the transpose
+    next_pos = array(INDEX_TYPECODE, indptr[:-1])
+    indices = array(INDEX_TYPECODE, [0]) * len(A.indices)
+    data = array(typecode_for(A.data), [0]) * len(A.data)
+    for i in range(m):
+        for k in range(A.indptr[i], A.indptr[i+1]):
+            pos = next_pos[A.indices[k]]
+            indices[pos] = i
+            data[pos] = A.data[k]
+            next_pos[A.indices[k]] = pos + 1
+
+    return CSRMatrix(indptr, indices, data, (n, m))
+
+def _frozen(values, typecode):
+    '''Returns `values` as a read-only memoryview of the given typecode,
+       backed by an immutable bytes object.
+    '''
+
+    return memoryview(array(typecode, values).tobytes()).cast(typecode)
+
+def _thawed(values):
+    '''Returns a memoryview made by _frozen() as an array.array, i.e to pickle it'''
+
+    return array(values.format, values)
+
+class LPModel:
+    '''An immutable, compact LP.
+
+        A         -- the constraint factors, as a CSRMatrix
+        b         -- the right side arguments
+        c         -- the factors of the object function
+        Eqin      -- the constraint types ('<=': -1 | '>=' : 1 | '=' : 0)
+        MinMax    -- 1 for max, -1 for min
+        VarConstr -- the variable constraints ('free' : 0 | '>= 0' : 1 | '<= 0' : -1)
+        var_names -- the names of the variables, one per column of A
+
+       The vectors (and the arrays of A) are read-only memoryviews of
+       64-bit integers, or of doubles for b, c and the data of A if they
+       hold floats. They are backed by bytes, so they can't be modified and
+       models can be hashed. Models hold no text and no parser, so they are
+       cheap to keep in memory and to pickle between processes.
+
+       Models are usually created by AplosParser.to_model().
+    '''
+
+    _FIELDS = ('A', 'b', 'c', 'Eqin', 'MinMax', 'VarConstr', 'var_names')
+
+    __slots__ = _FIELDS + ('_hash',)
+
+    def __init__(self, A, b, c, Eqin, MinMax, VarConstr, var_names):
+        set_field = object.__setattr__
+
+        indptr, indices, data, shape = A
+        A = CSRMatrix(_frozen(indptr, INDEX_TYPECODE), _frozen(indices, INDEX_TYPECODE),
+                      _frozen(data, typecode_for(data)), tuple(shape))
+
+        set_field(self, 'A', A)
+        set_field(self, 'b', _frozen(b, typecode_for(b)))
+        set_field(self, 'c', _frozen(c, typecode_for(c)))
+        set_field(self, 'Eqin', _frozen(Eqin, VALUE_TYPECODE))
+        set_field(self, 'MinMax', int(MinMax))
+        set_field(self, 'VarConstr', _frozen(VarConstr, VALUE_TYPECODE))
+        set_field(self, 'var_names', tuple(var_names))
+        set_field(self, '_hash', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LPModel is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("LPModel is immutable")
+
+    def __reduce__(self):
+        # Memoryviews can't be pickled, arrays can (as bytes)
+        A = CSRMatrix(*[_thawed(values) for values in self.A[:3]], self.A.shape)
+        vectors = [_thawed(getattr(self, field)) for field in ['b', 'c', 'Eqin']]
+
+        return (LPModel, (A, *vectors, self.MinMax, _thawed(self.VarConstr), self.var_names))
+
+    def __eq__(self, other):
+        if not isinstance(other, LPModel):
+            return NotImplemented
+
+        return all(getattr(self, field) == getattr(other, field) for field in LPModel._FIELDS)
+
+    def __hash__(self):
+        # Numbers are hashed by value, so models equal
+        # with ints and with floats hash the same
+        if self._hash is None:
+            values = tuple(tuple(values) for values in self.A[:3]) + (self.A.shape,)
+            values += tuple(tuple(getattr(self, field)) for field in ['b', 'c', 'Eqin', 'VarConstr'])
+
+            object.__setattr__(self, '_hash', hash(values + (self.MinMax, self.var_names)))
+
+        return self._hash
+
+    def __repr__(self):
+        return 'LPModel(m={0}, n={1}, nnz={2})'.format(self.A.shape[0], self.A.shape[1], len(self.A.data))
+
+    def dense_A(self):
+        '''Returns A as a dense list of lists'''
+
+        m, n = self.A.shape
+        A = [[0]*n for _ in range(m)]
+        for i in range(m):
+            for k in range(self.A.indptr[i], self.A.indptr[i+1]):
+                A[i][self.A.indices[k]] = self.A.data[k]
+
+        return A
+
+    def dual(self):
+        '''Returns the dual of the LP as another LPModel.
+
+           Rules:
+            * A gets transposed
+            * b & c get swapped
+            * min becomes max
+            * for a max LP, x(j) >= 0 : constraint(j) is '>='
+                            x(j) <= 0 : constraint(j) is '<='
+              for a min LP it's the other way around,
+              and if x(j) is free   : constraint(j) is '='
+            * for a max LP, constraint(i) '<=' : w(i) is '>= 0'
+                            constraint(i) '>=' : w(i) is '<= 0'
+              for a min LP it's the other way around,
+              and if constraint(i) is '=' : w(i) is 'free'
+        '''
+
+        # Both rules map a value to itself for max and to its opposite for min
+        eqin = [self.MinMax * constr for constr in self.VarConstr]
+        var_constr = [-self.MinMax * constr for constr in self.Eqin]
+        names = ['w' + str(i) for i in range(1, len(self.b) + 1)]
+
+        return LPModel(transpose(self.A), self.c, self.b, eqin, -self.MinMax, var_constr, names)
@@ -0,0 +1,83 @@
+# coding=utf-8
+
+from array import array
+
+# Typecode used for the index and value arrays of sparse matrices.
+# 'q' is a signed 64-bit integer and 'd' a double.
+INDEX_TYPECODE = 'q'
+VALUE_TYPECODE = 'q'
+FLOAT_TYPECODE = 'd'
+
+SPARSE_FORMATS = ('coo', 'csr')
+
+def typecode_for(values):
+    '''Returns the typecode able to hold every one of the given numbers'''
+
+    return FLOAT_TYPECODE if any(isinstance(v, float) for v in values) else VALUE_TYPECODE
+
+def build_sparse(rows, shape, format='coo', typecode=VALUE_TYPECODE):
+    '''Builds a sparse matrix out of `rows` in a single pass.
+
+       `rows` is an iterable yielding, for every row, an iterable of
+       (value, column) pairs. If a column appears more than once in the
+       same row the last value wins, exactly like in the dense matrix.
+       Zero values are not stored.
+
+       `format` can be either 'coo' or 'csr':
+
+        coo -- {'row':[...], 'col':[...], 'data':[...], 'shape':(m, n)}
+        csr -- {'indptr':[...], 'indices':[...], 'data':[...], 'shape':(m, n)}
+
+       Every list is an `array.array` of 64-bit integers, except for
+       'data' which uses `typecode` ('d' for floats). With typecode=None
+       'data' is a plain list, i.e for Fractions.
+
+       A ValueError is raised if a column doesn't fit in `shape`.
+    '''
+
+    if format not in SPARSE_FORMATS:
+        raise ValueError("Unknown sparse format '{0}'. Use one of: {1}".format(format, ', '.join(SPARSE_FORMATS)))
+
+    row_idx = array(INDEX_TYPECODE)
+    indptr = array(INDEX_TYPECODE, [0])
+    indices = array(INDEX_TYPECODE)
+    data = array(typecode) if typecode else []
+    n = shape[1]
+
+    for i, terms in enumerate(rows):
+        # Later terms overwrite earlier ones on the same column
+        row = {}
+        for value, col in terms:
+            row[col] = value
+
+        for col in sorted(row):
+            if not 0 <= col < n:
+                raise ValueError("Column {0} of row {1} is out of range for shape {2}".format(col, i, shape))
+
+            if row[col]:
+                indices.append(col)
+                data.append(row[col])
+                if format == 'coo':
+                    row_idx.append(i)
+
+        indptr.append(len(indices))
+
+    if format == 'coo':
+        return {'row':row_idx, 'col':indices, 'data':data, 'shape':shape}
+    else:
+        return {'indptr':indptr, 'indices':indices, 'data':data, 'shape':shape}
+
+def to_scipy(matrix):
+    '''Converts a sparse matrix returned by Aplos into the
+       corresponding SciPy sparse matrix (coo_matrix or csr_matrix).
+
+       SciPy is an optional dependency. An ImportError is raised
+       if it isn't installed.
+    '''
+
+    from scipy import sparse
+
+    if 'indptr' in matrix:
+        return sparse.csr_matrix((matrix['data'], matrix['indices'], matrix['indptr']), shape=matrix['shape'])
+    else:
+        return sparse.coo_matrix((matrix['data'], (matrix['row'], matrix['col'])), shape=matrix['shape'])
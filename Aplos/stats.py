@@ -0,0 +1,129 @@
+# coding=utf-8
+
+import os
+import sys
+import time
+
+# Setting this environment variable to a non-empty value other than '0'
+# enables statistics for every AplosParser, without any code changes.
+STATS_ENV_VAR = 'APLOS_STATS'
+
+def stats_enabled_by_env():
+    '''Returns True if statistics are enabled through APLOS_STATS'''
+
+    return os.environ.get(STATS_ENV_VAR, '') not in ('', '0')
+
+def _traced_memory():
+    '''Returns the memory currently traced by tracemalloc, or None if
+       it isn't tracing.
+
+       tracemalloc is only imported if it has been imported already or
+       PYTHONTRACEMALLOC is set, since it can't be tracing otherwise.
+    '''
+
+    tracemalloc = sys.modules.get('tracemalloc')
+    if tracemalloc is None:
+        if not os.environ.get('PYTHONTRACEMALLOC'):
+            return None
+        import tracemalloc
+
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+
+class _Stage:
+    '''Context manager recording a single run of a stage'''
+
+    __slots__ = ('stats', 'name', 'start', 'memory')
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.memory = _traced_memory()
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+
+        allocated = None
+        if self.memory is not None:
+            memory = _traced_memory()
+            if memory is not None:
+                allocated = memory - self.memory
+
+        self.stats.add(self.name, elapsed, allocated)
+
+class _NoStage:
+    '''Context manager used when statistics are disabled'''
+
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+NO_STAGE = _NoStage()
+
+class ParserStats:
+    '''Collects per-stage statistics of an AplosParser:
+
+        calls   -- how many times the stage ran
+        seconds -- the total wall time spent in the stage
+        bytes   -- the net memory allocated by the stage. Only measured
+                   while tracemalloc is tracing (i.e PYTHONTRACEMALLOC=1),
+                   otherwise it stays None.
+
+       The stages are:
+
+        read            -- reading the lines of the LP (file or text)
+        tokenize        -- parsing lines into their intermediate representation
+        detect_errors   -- validating the LP
+        get_vars        -- building the variable index
+        get_matrix      -- computing primal matrices (cache misses only)
+        get_dual_matrix -- computing dual matrices (cache misses only)
+        write_matrices  -- formatting and writing matrices to a file
+        read_matrices   -- reading matrices from a file
+
+       Stages can be nested (i.e tokenize runs inside detect_errors),
+       in which case the time of the inner stage is also counted in the
+       outer one.
+
+       If given, `callback(stage, seconds, bytes)` is called every time
+       a stage finishes. The same ParserStats can be shared by many parsers.
+    '''
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.stages = {}
+
+    def record(self, stage):
+        '''Returns a context manager that records one run of `stage`'''
+
+        return _Stage(self, stage)
+
+    def add(self, stage, seconds, allocated=None):
+        '''Adds one run of `stage` that took `seconds` and allocated `allocated` bytes'''
+
+        entry = self.stages.get(stage)
+        if entry is None:
+            entry = self.stages[stage] = {'calls':0, 'seconds':0.0, 'bytes':None}
+
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+        if allocated is not None:
+            entry['bytes'] = (entry['bytes'] or 0) + allocated
+
+        if self.callback:
+            self.callback(stage, seconds, allocated)
+
+    def as_dict(self):
+        '''Returns a copy of the statistics, as {stage: {'calls', 'seconds', 'bytes'}}'''
+
+        return {stage:dict(entry) for stage, entry in self.stages.items()}
+
+    def reset(self):
+        '''Discards every statistic collected so far'''
+
+        self.stages = {}
@@ -0,0 +1,68 @@
+# coding=utf-8
+'''Synthetic LP generator used by the benchmarks.
+
+   Run it directly to write an LP file:
+
+        python benchmarks/generate.py lp.txt -m 10000 -n 500 --density 0.01
+'''
+
+import argparse
+import random
+
+def format_terms(terms):
+    '''Turns (factor, variable index) pairs into the text of an LP line'''
+
+    text = []
+    for i, (factor, var) in enumerate(terms):
+        sign = '-' if factor < 0 else '+'
+        factor = abs(factor)
+        term = ('' if factor == 1 else str(factor)) + 'x' + str(var)
+
+        if i == 0:
+            text.append(term if sign == '+' else '-' + term)
+        else:
+            text.append(sign + ' ' + term)
+
+    return ' '.join(text)
+
+def generate_lp(m, n, density=0.1, seed=0):
+    '''Yields the lines of a random, valid LP with `m` constraints
+       over `n` variables.
+
+       Every constraint uses round(density * n) variables (at least
+       one) with non-zero factors in [-9, 9]. The objective function
+       uses every variable, so the LP is always n variables wide.
+    '''
+
+    rand = random.Random(seed)
+    factors = [f for f in range(-9, 10) if f]
+    width = max(1, int(round(density * n)))
+
+    yield 'max ' + format_terms([(rand.choice(factors), j) for j in range(1, n+1)])
+
+    for i in range(m):
+        variables = sorted(rand.sample(range(1, n+1), width))
+        line = format_terms([(rand.choice(factors), j) for j in variables])
+        line += ' ' + rand.choice(['<=', '>=', '=']) + ' ' + str(rand.randint(0, 100))
+
+        yield ('s.t. ' + line) if i == 0 else line
+
+    yield 'END'
+
+def write_lp(path, m, n, density=0.1, seed=0):
+    '''Writes the LP of generate_lp() to `path`, line by line'''
+
+    with open(path, 'w') as lp_file:
+        for line in generate_lp(m, n, density, seed):
+            lp_file.write(line + '\n')
+
+if __name__ == '__main__':
+    args = argparse.ArgumentParser(description='Write a random LP file.')
+    args.add_argument('path')
+    args.add_argument('-m', type=int, default=1000, help='number of constraints')
+    args.add_argument('-n', type=int, default=100, help='number of variables')
+    args.add_argument('--density', type=float, default=0.1, help='fraction of variables used by each constraint')
+    args.add_argument('--seed', type=int, default=0)
+    args = args.parse_args()
+
+    write_lp(args.path, args.m, args.n, args.density, args.seed)
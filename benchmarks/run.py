@@ -0,0 +1,132 @@
+# coding=utf-8
+'''Benchmarks for AplosParser.
+
+   Times every stage of the parsing pipeline on synthetic LPs (see
+   generate.py) of increasing size and reports the wall time and the
+   peak memory allocated by each stage:
+
+        python benchmarks/run.py --sizes 10 100 1000 10000 --json bench.json
+
+   Time is the best of --repeat runs. Peak memory is measured in a
+   separate run with tracemalloc, so tracing doesn't skew the timings.
+'''
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Aplos import AplosParser
+from generate import write_lp
+
+def run_stages(lp_path, out_dir, measure):
+    '''Runs every stage of the pipeline once on the LP at `lp_path`.
+
+       `measure(stage, function)` is called for every stage and
+       returns the result of function().
+    '''
+
+    text_path = os.path.join(out_dir, 'matrices.txt')
+    binary_path = os.path.join(out_dir, 'matrices.bin')
+
+    parser = measure('init', lambda: AplosParser(filename=lp_path))
+    measure('detect_errors', parser.detect_errors)
+    measure('get_matrices', parser.get_matrices)
+
+    # The dual is measured without the primal matrices already cached
+    parser.cache_clear()
+    measure('get_dual_matrices', parser.get_dual_matrices)
+
+    measure('write_matrices_to_file', lambda: parser.write_matrices_to_file(text_path))
+    measure('read_matrices_from_file', lambda: parser.read_matrices_from_file(text_path))
+    measure('write_binary', lambda: parser.write_matrices_to_file(binary_path, format='binary'))
+    measure('read_binary', lambda: parser.read_matrices_from_file(binary_path))
+
+def time_stages(lp_path, out_dir, repeat):
+    '''Returns the best wall time of every stage, in seconds'''
+
+    best = {}
+
+    def measure(stage, function):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+
+        best[stage] = min(best.get(stage, elapsed), elapsed)
+        return result
+
+    for _ in range(repeat):
+        run_stages(lp_path, out_dir, measure)
+
+    return best
+
+def trace_stages(lp_path, out_dir):
+    '''Returns the peak memory allocated by every stage, in bytes'''
+
+    peaks = {}
+
+    def measure(stage, function):
+        tracemalloc.start()
+        try:
+            result = function()
+            peaks[stage] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return result
+
+    run_stages(lp_path, out_dir, measure)
+
+    return peaks
+
+def main():
+    args = argparse.ArgumentParser(description='Benchmark the AplosParser pipeline.')
+    args.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                      help='numbers of constraints to benchmark')
+    args.add_argument('-n', type=int, default=100, help='number of variables')
+    args.add_argument('--density', type=float, default=0.1, help='fraction of variables used by each constraint')
+    args.add_argument('--repeat', type=int, default=3, help='timed runs per size')
+    args.add_argument('--no-memory', action='store_true', help='skip the peak memory measurements')
+    args.add_argument('--json', help='write the results to this file')
+    args = args.parse_args()
+
+    results = []
+
+    print('{0:>9} {1:<24} {2:>12} {3:>14}'.format('m', 'stage', 'seconds', 'peak bytes'))
+
+    with tempfile.TemporaryDirectory() as tmp_dir, warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+
+        for m in args.sizes:
+            lp_path = os.path.join(tmp_dir, 'lp_{0}.txt'.format(m))
+            write_lp(lp_path, m, args.n, args.density)
+
+            times = time_stages(lp_path, tmp_dir, args.repeat)
+            peaks = {} if args.no_memory else trace_stages(lp_path, tmp_dir)
+
+            for stage, seconds in times.items():
+                result = {'m':m, 'n':args.n, 'density':args.density, 'stage':stage,
+                          'seconds':seconds, 'peak_bytes':peaks.get(stage)}
+                results.append(result)
+
+                print('{0:>9} {1:<24} {2:>12.6f} {3:>14}'.format(m, stage, seconds, str(peaks.get(stage, '-'))))
+
+    if args.json:
+        report = {
+            'python':platform.python_version(),
+            'platform':platform.platform(),
+            'repeat':args.repeat,
+            'results':results,
+        }
+        with open(args.json, 'w') as json_file:
+            json.dump(report, json_file, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+from Aplos import AplosParser, exceptions
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
+import pytest
+
+
+def stream_of(data):
+    '''Returns a StreamReader holding `data`'''
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+
+    return reader
+
+class ChunkedReader:
+    '''A stream returning `chunk_size` bytes of `data` per read(),
+       like a socket receiving the data in small packets
+    '''
+
+    def __init__(self, data, chunk_size):
+        self.chunks = [data[i:i+chunk_size] for i in range(0, len(data), chunk_size)]
+
+    async def read(self, n=-1):
+        return self.chunks.pop(0) if self.chunks else b''
+
+def get_main_lp():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    with open(test_file, 'rb') as lp_file:
+        return test_file, lp_file.read()
+
+def test_from_stream():
+
+    test_file, data = get_main_lp()
+
+    async def parse():
+        parser = await AplosParser.from_stream(ChunkedReader(data, 3))
+        errors = await parser.adetect_errors()
+        return parser, errors, await parser.aget_matrices(), await parser.aget_dual_matrices()
+
+    parser, errors, matrices, dual = asyncio.run(parse())
+
+    expected = AplosParser(filename=test_file)
+    expected.detect_errors()
+
+    assert errors == [] and \
+           parser.lp_lines == expected.lp_lines and \
+           matrices == expected.get_matrices() and \
+           dual == expected.get_dual_matrices()
+
+def test_from_stream_split_characters():
+
+    # The en-dash is split between two chunks
+    text = 'max 3x1 – 2x2|s.t. x1 + x2 <= 4|END'.encode('utf-8')
+
+    async def parse():
+        parser = await AplosParser.from_stream(ChunkedReader(text, 1), delimeter='|')
+        await parser.adetect_errors()
+        return await parser.aget_matrices()
+
+    assert asyncio.run(parse())['c'] == [3, -2]
+
+def test_from_stream_crlf():
+
+    # i.e from a socket
+    test_file, data = get_main_lp()
+    crlf = data.replace(b'\r\n', b'\n').replace(b'\n', b'\r\n')
+
+    async def parse():
+        parser = await AplosParser.from_stream(ChunkedReader(crlf, 5))
+        errors = await parser.adetect_errors()
+        return parser, errors
+
+    parser, errors = asyncio.run(parse())
+
+    expected = AplosParser(filename=test_file)
+    expected.detect_errors()
+
+    assert errors == [] and \
+           parser.lp_lines == expected.lp_lines
+
+def test_from_stream_stops_at_end():
+
+    # Reading stops with the chunk that completes the 'END' line
+    text = b'max 3x1\ns.t. x1 <= 4\nEND\nmore data'
+
+    async def parse():
+        reader = ChunkedReader(text, 1)
+        parser = await AplosParser.from_stream(reader)
+        return parser, reader.chunks
+
+    parser, rest = asyncio.run(parse())
+
+    assert parser.lp_lines == ['max3x1', 's.t.x1<=4', 'END'] and \
+           b''.join(rest) == b'more data'
+
+def test_from_stream_executor():
+
+    _, data = get_main_lp()
+
+    async def parse(executor):
+        parser = await AplosParser.from_stream(stream_of(data), executor=executor)
+        await parser.adetect_errors()
+        return parser, await parser.aget_matrices(sparse=True)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parser, matrices = asyncio.run(parse(executor))
+
+    assert parser.executor is executor and \
+           list(matrices['A']['data']) == [1, 2, 2, 5]
+
+def test_from_stream_empty():
+
+    async def parse():
+        parser = await AplosParser.from_stream(stream_of(b''))
+        await parser.adetect_errors()
+
+    with pytest.warns(RuntimeWarning):
+        with pytest.raises(exceptions.EmptyLPException):
+            asyncio.run(parse())
@@ -0,0 +1,77 @@
+from Aplos import AplosParser, exceptions
+import os
+import pytest
+
+
+def test_binary_round_trip(tmpdir):
+
+    FILE_NAME = 'secondary_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+
+    if not parser.detect_errors():
+        output_file = str(tmpdir.join('output.bin'))
+        parser.write_matrices_to_file(output_file, format='binary')
+
+        matrices = parser.read_matrices_from_file(output_file)
+        expected = parser.get_matrices(sparse=True)
+
+        assert sorted(matrices) == sorted(expected)
+        assert matrices['A']['shape'] == expected['A']['shape']
+        for key in ['row', 'col', 'data']:
+            assert matrices['A'][key].tolist() == list(expected['A'][key])
+        for key in ['b', 'c', 'Eqin', 'MinMax']:
+            assert matrices[key].tolist() == expected[key]
+
+def test_binary_round_trip_dual(tmpdir):
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+
+    if not parser.detect_errors():
+        output_file = str(tmpdir.join('output_dual.bin'))
+        parser.write_matrices_to_file(output_file, dual=True, format='binary')
+
+        matrices = parser.read_matrices_from_file(output_file, dual=True)
+        expected = parser.get_dual_matrices()
+
+        A = [[0]*matrices['A']['shape'][1] for _ in range(matrices['A']['shape'][0])]
+        for i, j, el in zip(matrices['A']['row'], matrices['A']['col'], matrices['A']['data']):
+            A[i][j] = el
+
+        assert A == expected['A']
+        for key in ['b', 'c', 'Eqin', 'MinMax', 'VarConstr']:
+            assert matrices[key].tolist() == expected[key]
+
+def test_binary_truncated(tmpdir):
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+
+    if not parser.detect_errors():
+        output_file = tmpdir.join('output.bin')
+        parser.write_matrices_to_file(str(output_file), format='binary')
+        output_file.write_binary(output_file.read_binary()[:-8])
+
+        with pytest.raises(exceptions.LPReadException):
+            matrices = parser.read_matrices_from_file(str(output_file))
+
+def test_write_unknown_format(tmpdir):
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+
+    if not parser.detect_errors():
+        with pytest.raises(ValueError):
+            parser.write_matrices_to_file(str(tmpdir.join('output.csv')), format='csv')
@@ -0,0 +1,82 @@
+from Aplos import AplosParser, exceptions
+import bz2
+import gzip
+import lzma
+import os
+import pytest
+
+COMPRESSIONS = [('.gz', gzip), ('.bz2', bz2), ('.xz', lzma)]
+
+def get_main_lp():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    with open(test_file, 'rb') as lp_file:
+        return test_file, lp_file.read()
+
+@pytest.mark.parametrize('extension,module', COMPRESSIONS)
+def test_read_compressed_lp(tmpdir, extension, module):
+
+    test_file, content = get_main_lp()
+    compressed_file = tmpdir.join('lp.txt' + extension)
+    compressed_file.write_binary(module.compress(content))
+
+    parser = AplosParser(filename=str(compressed_file))
+
+    assert parser.lp_lines == AplosParser(filename=test_file).lp_lines
+
+def test_read_compressed_lp_no_extension(tmpdir):
+
+    test_file, content = get_main_lp()
+    compressed_file = tmpdir.join('lp.txt')
+    compressed_file.write_binary(gzip.compress(content))
+
+    parser = AplosParser(filename=str(compressed_file))
+
+    assert parser.lp_lines == AplosParser(filename=test_file).lp_lines
+
+@pytest.mark.parametrize('extension,module', COMPRESSIONS)
+def test_matrices_compressed_round_trip(tmpdir, extension, module):
+
+    test_file, content = get_main_lp()
+    parser = AplosParser(filename=test_file)
+
+    if not parser.detect_errors():
+        output_file = str(tmpdir.join('output.txt' + extension))
+        parser.write_matrices_to_file(output_file, dual=True)
+
+        with module.open(output_file, 'rt') as of:
+            CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+            with open(os.path.join(CUR_DIR, 'files/matrices_file_dual.txt')) as ef:
+                assert of.read() == ef.read()
+
+        assert parser.read_matrices_from_file(output_file, dual=True) == parser.get_dual_matrices()
+
+def test_binary_compressed_round_trip(tmpdir):
+
+    test_file, content = get_main_lp()
+    parser = AplosParser(filename=test_file)
+
+    if not parser.detect_errors():
+        output_file = str(tmpdir.join('output.bin.xz'))
+        parser.write_matrices_to_file(output_file, format='binary')
+
+        matrices = parser.read_matrices_from_file(output_file)
+
+        assert matrices['b'].tolist() == parser.get_matrix('b') and \
+               matrices['A']['data'].tolist() == [1, 2, 2, 5]
+
+def test_zstd_round_trip(tmpdir):
+
+    pytest.importorskip('zstandard')
+
+    test_file, content = get_main_lp()
+    parser = AplosParser(filename=test_file)
+
+    if not parser.detect_errors():
+        output_file = str(tmpdir.join('output.txt.zst'))
+        parser.write_matrices_to_file(output_file)
+
+        assert parser.read_matrices_from_file(output_file) == parser.get_matrices()
@@ -1,4 +1,4 @@
-from Aplos import AplosParser, exceptions
+from Aplos import AplosParser, Diagnostic, exceptions
 import os
 import pytest
 
@@ -53,3 +53,49 @@ def test_det_errors_no_end():
         expected.append('Right side argument missing from some constraints')
 
     assert errors == expected
+
+def test_det_errors_diagnostics():
+
+    FILE_NAME = 'error_lp_1.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    with pytest.warns(RuntimeWarning):
+        parser = AplosParser(filename=test_file)
+        parser.detect_errors()
+
+    expected = []
+    expected.append(Diagnostic('minmax-missing', 0, 0))
+    expected.append(Diagnostic('type-missing', 4))
+    expected.append(Diagnostic('rhs-missing', 4))
+    expected.append(Diagnostic('type-missing', 5))
+    expected.append(Diagnostic('rhs-missing', 5))
+    expected.append(Diagnostic('end-missing', 6))
+
+    assert parser.diagnostics == expected
+
+def test_det_errors_fail_fast():
+
+    FILE_NAME = 'error_lp_1.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    with pytest.warns(RuntimeWarning):
+        parser = AplosParser(filename=test_file)
+        errors = parser.detect_errors(fail_fast=True)
+
+    assert errors == ['Min/Max is not specified for object function'] and \
+           len(parser.diagnostics) == 1
+
+    with pytest.raises(exceptions.LPErrorException):
+        parser.get_matrix('A')
+
+def test_det_errors_twice():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+
+    assert parser.detect_errors() == [] and parser.detect_errors() == []
@@ -62,3 +62,55 @@ def test_get_matrix():
                minmax == expected_minmax and \
                var_constr == expected_var_constr
 
+
+def test_get_dual_matrix_min():
+
+    text = '''min 3x1 - 5x2 + x4
+              st x2 + x3 = 2
+              2x1 + 3x2 + 5x4 >= 5
+              x1 - 5x2 + 2x3 - 4x4 <= 10
+              END'''
+
+    parser = AplosParser(text=text)
+    if not parser.detect_errors():
+        dual = parser.get_dual_matrices()
+
+        assert dual['A'] == [[0,2,1],[1,3,-5],[1,0,2],[0,5,-4]] and \
+               dual['b'] == [3,-5,0,1] and \
+               dual['c'] == [2,5,10] and \
+               dual['Eqin'] == [-1,-1,-1,-1] and \
+               dual['MinMax'] == [1] and \
+               dual['VarConstr'] == [0,1,-1]
+
+        # Same rules as LPModel.dual()
+        model = parser.to_model().dual()
+        assert list(model.Eqin) == dual['Eqin'] and \
+               list(model.VarConstr) == dual['VarConstr']
+
+def test_get_dual_matrix_sparse():
+
+    text = '''min 3x1 - 5x2 + x4
+              st x2 + x3 = 2
+              2x1 + 3x2 + 5x4 >= 5
+              x1 - 5x2 + 2x3 - 4x4 <= 10
+              END'''
+
+    parser = AplosParser(text=text)
+    if not parser.detect_errors():
+        coo = parser.get_dual_matrix('A', sparse=True)
+        csr = parser.get_dual_matrix('A', sparse=True, format='csr')
+
+        dense = [[0] * 3 for _ in range(4)]
+        for i, j, value in zip(coo['row'], coo['col'], coo['data']):
+            dense[i][j] = value
+
+        assert dense == parser.get_dual_matrix('A') and coo['shape'] == (4, 3)
+
+        # The dual 'A' in csr form is the primal 'A' in csc form
+        assert list(csr['indptr']) == [0, 2, 5, 7, 9] and \
+               list(csr['indices']) == [1, 2, 0, 1, 2, 0, 2, 1, 2] and \
+               list(csr['data']) == [2, 1, 1, 3, -5, 1, 2, 5, -4] and \
+               csr['shape'] == (4, 3)
+
+        with pytest.raises(ValueError):
+            parser.get_dual_matrix('b', sparse=True)
@@ -0,0 +1,127 @@
+from Aplos import AplosParser, exceptions
+import pytest
+
+
+TEXT = "Max 3x1 + 2x2 | st x1 + 2x2 <= 9 | 2x1 + 5x2 <= 4 | END"
+
+def get_parser():
+
+    parser = AplosParser(text=TEXT, delimeter='|')
+    assert parser.detect_errors() == []
+
+    return parser
+
+def reparsed(parser):
+    '''Returns a new parser for the current lines of `parser`'''
+
+    fresh = AplosParser(text='|'.join(parser.lp_lines + ['END']), delimeter='|')
+    assert fresh.detect_errors() == []
+
+    return fresh
+
+def test_add_constraint():
+
+    parser = get_parser()
+    before = parser.get_matrices()
+
+    assert parser.add_constraint('x1 - x3 >= 2') == 2
+
+    assert parser.get_matrices() == {'A':[[1,2,0],[2,5,0],[1,0,-1]], 'b':[9,4,2], 'c':[3,2,0],
+                                     'Eqin':[-1,-1,1], 'MinMax':[1]} and \
+           parser.get_dimensions() == {'m':3, 'n':3} and \
+           parser.get_vars() == ['x1', 'x2', 'x3']
+
+    # Matrices returned before the edit are left as they were
+    assert before['A'] == [[1,2],[2,5]] and before['b'] == [9,4]
+
+def test_replace_constraint():
+
+    parser = get_parser()
+    parser.get_matrices()
+
+    parser.replace_constraint(0, 'x2 = 7')
+
+    assert parser.get_matrices() == reparsed(parser).get_matrices() and \
+           parser.get_matrix('A') == [[0,1],[2,5]] and \
+           parser.get_matrix('Eqin') == [0,-1]
+
+    # The first constraint keeps its initializer
+    assert parser.detect_errors() == []
+
+def test_remove_constraint():
+
+    parser = get_parser()
+    parser.add_constraint('x3 <= 1')
+    parser.remove_constraint(2)
+
+    assert parser.get_matrices() == {'A':[[1,2],[2,5]], 'b':[9,4], 'c':[3,2], 'Eqin':[-1,-1], 'MinMax':[1]} and \
+           parser.get_dimensions() == {'m':2, 'n':2}
+
+    parser.remove_constraint(0)
+
+    assert parser.get_matrices() == reparsed(parser).get_matrices() and \
+           parser.detect_errors() == []
+
+    with pytest.raises(exceptions.LPErrorException):
+        parser.remove_constraint(0)
+
+def test_set_objective():
+
+    parser = get_parser()
+    parser.get_dual_matrices()
+
+    parser.set_objective('min x1 - 4x3')
+
+    assert parser.get_matrix('c') == [1,0,-4] and \
+           parser.get_matrix('MinMax') == [-1] and \
+           parser.get_matrix('A') == [[1,2,0],[2,5,0]] and \
+           parser.get_dual_matrices() == reparsed(parser).get_dual_matrices()
+
+def test_edit_unsorted_vars():
+
+    parser = get_parser()
+    parser.get_matrices()
+
+    parser.add_constraint('6x3 + x6 + x2 + x1 = 8')
+    parser.set_objective('max x4 + x1')
+
+    assert parser.get_dimensions() == {'m':3, 'n':6} and \
+           parser.get_matrices() == reparsed(parser).get_matrices() and \
+           parser.get_matrix('A')[2] == [1,1,6,0,0,1]
+
+def test_edit_updates_cache():
+
+    parser = get_parser()
+    parser.get_matrices()
+    misses = parser.cache_info()['misses']
+
+    parser.add_constraint('x1 + x2 <= 3')
+    parser.replace_constraint(1, 'x2 >= 1')
+    parser.get_matrices()
+
+    # The dense matrices are edited, not rebuilt
+    assert parser.cache_info()['misses'] == misses
+
+def test_edit_errors():
+
+    parser = get_parser()
+
+    with pytest.raises(exceptions.LPErrorException):
+        parser.add_constraint('x1 + x2')
+    with pytest.raises(exceptions.LPErrorException):
+        parser.replace_constraint(1, 'x1 x2 <= 4')
+    with pytest.raises(exceptions.LPErrorException):
+        parser.set_objective('3x1 + x2')
+    with pytest.raises(IndexError):
+        parser.replace_constraint(2, 'x1 <= 4')
+
+    # Nothing changed
+    assert parser.get_matrices() == reparsed(get_parser()).get_matrices() and \
+           parser.lp_lines == get_parser().lp_lines
+
+def test_edit_unchecked():
+
+    parser = AplosParser(text=TEXT, delimeter='|')
+
+    with pytest.raises(exceptions.LPErrorException):
+        parser.add_constraint('x1 <= 4')
@@ -0,0 +1,117 @@
+from Aplos import AplosParser, exceptions
+from fractions import Fraction
+import pytest
+
+FLOAT_LP = '''max 2.5x1 - 1e-3x2 + .5x3
+s.t. x1 + 0.1x2 <= -3
+-x1 + 2x3 >= 2.5
+3x1 - 1E+2x2 = 0
+end'''
+
+def test_float_coefficients():
+
+    parser = AplosParser(text=FLOAT_LP)
+    assert parser.detect_errors() == []
+
+    assert parser.get_matrix('A') == [[1, 0.1, 0], [-1, 0, 2], [3, -100.0, 0]]
+    assert parser.get_matrix('b') == [-3, 2.5, 0]
+    assert parser.get_matrix('c') == [2.5, -0.001, 0.5]
+    assert parser.get_matrix('Eqin') == [-1, 1, 0]
+
+def test_integer_coefficients_stay_int():
+
+    parser = AplosParser(text='max 3x1 + 2x2\ns.t. x1 + 2x2 <= -9\nEND')
+    if not parser.detect_errors():
+        b = parser.get_matrix('b')
+        assert b == [-9] and type(b[0]) is int
+        assert all(type(el) is int for el in parser.get_matrix('c'))
+
+def test_dtype():
+
+    parser = AplosParser(text=FLOAT_LP)
+    if not parser.detect_errors():
+        assert parser.get_matrix('c', dtype=Fraction) == [Fraction(5, 2), Fraction(-1, 1000), Fraction(1, 2)]
+        assert parser.get_matrix('A', dtype=Fraction)[0] == [1, Fraction(1, 10), 0]
+
+        b = parser.get_matrix('b', dtype=float)
+        assert b == [-3.0, 2.5, 0.0] and all(type(el) is float for el in b)
+
+        # Only non-integer numbers are rejected
+        assert parser.get_matrix('Eqin', dtype=int) == [-1, 1, 0]
+        with pytest.raises(ValueError):
+            parser.get_matrix('b', dtype=int)
+
+        with pytest.raises(ValueError):
+            parser.get_matrix('b', dtype=complex)
+
+        matrices = parser.get_matrices(dtype=Fraction)
+        assert matrices['b'] == [-3, Fraction(5, 2), 0]
+
+def test_float_sparse():
+
+    parser = AplosParser(text=FLOAT_LP)
+    if not parser.detect_errors():
+        A = parser.get_matrix('A', sparse=True, format='csr')
+
+        assert A['data'].format == 'd'
+        assert list(A['data']) == [1.0, 0.1, -1.0, 2.0, 3.0, -100.0]
+
+        A = parser.get_matrix('A', sparse=True, dtype=Fraction)
+        assert A['data'] == [1, Fraction(1, 10), -1, 2, 3, -100]
+
+def test_float_numpy():
+
+    np = pytest.importorskip('numpy')
+
+    parser = AplosParser(text=FLOAT_LP)
+    if not parser.detect_errors():
+        A = parser.get_matrix('A', backend='numpy')
+
+        assert A.dtype == np.float64
+        assert A.tolist() == parser.get_matrix('A')
+        assert parser.get_matrix('b', backend='numpy', dtype=Fraction).dtype == object
+
+        with pytest.raises(ValueError):
+            parser.get_matrix('A', backend='numpy', dtype=int)
+
+    parser = AplosParser(text='max 2.5x1\ns.t. 2.0x1 <= 4\nEND')
+    if not parser.detect_errors():
+        A = parser.get_matrix('A', backend='numpy', dtype=int)
+
+        # The numbers are checked without building the list of lists
+        assert A.dtype == np.int64 and A.tolist() == [[2]] and \
+               parser.cache_info()['size'] == 1
+
+def test_float_round_trip(tmpdir):
+
+    parser = AplosParser(text=FLOAT_LP)
+    if not parser.detect_errors():
+        expected = parser.get_matrices()
+
+        output_file = str(tmpdir.join('output.txt'))
+        parser.write_matrices_to_file(output_file)
+        assert parser.read_matrices_from_file(output_file) == expected
+
+        output_file = str(tmpdir.join('output.bin'))
+        parser.write_matrices_to_file(output_file, format='binary')
+        matrices = parser.read_matrices_from_file(output_file)
+
+        assert matrices['A']['data'].tolist() == [1.0, 0.1, -1.0, 2.0, 3.0, -100.0]
+        assert matrices['b'].tolist() == expected['b']
+        assert matrices['c'].tolist() == expected['c']
+        assert matrices['Eqin'].tolist() == expected['Eqin']
+
+def test_float_model():
+
+    parser = AplosParser(text=FLOAT_LP)
+    if not parser.detect_errors():
+        model = parser.to_model()
+
+        assert model.b.format == 'd'
+        assert model.dense_A() == parser.get_matrix('A')
+        assert model.dual().dense_A() == [list(col) for col in zip(*parser.get_matrix('A'))]
+
+def test_exponent_is_not_a_sign():
+
+    parser = AplosParser(text='max 1e-3x1 + 2x2\ns.t. 1e+2x1 - x2 <= 5\nEND')
+    assert parser.detect_errors() == []
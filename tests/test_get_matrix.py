@@ -59,3 +59,26 @@ def test_get_matrix():
                Eqin == expected_Eqin and \
                minmax == expected_minmax
 
+
+def test_get_matrix_shared_prefix():
+
+    # Adding the hidden factor of 'x1' must not touch 'x10' or 'x11'
+    text = 'max x1 + 3x10 - x11\ns.t. 2x10 + x1 - 4x11 <= 5\nEND'
+
+    parser = AplosParser(text=text)
+    if not parser.detect_errors():
+        assert parser.get_matrix('c') == [1, 0, 0, 0, 0, 0, 0, 0, 0, 3, -1] and \
+               parser.get_matrix('A') == [[1, 0, 0, 0, 0, 0, 0, 0, 0, 2, -4]]
+
+def test_get_matrix_unsorted_vars():
+
+    # The width of a line is its largest variable, not its last one
+    text = 'max 3x1 + 2x2\ns.t. x3 + x1 <= 4\nEND'
+
+    parser = AplosParser(text=text)
+    assert parser.detect_errors() == []
+
+    assert parser.get_vars() == ['x1', 'x2', 'x3'] and \
+           parser.get_vars(1)['extended'] == ['x1', 'x2', 'x3'] and \
+           parser.get_matrix('A') == [[1, 0, 1]] and \
+           parser.get_matrix('c') == [3, 2, 0]
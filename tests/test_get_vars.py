@@ -73,4 +73,60 @@ def test_get_vars_no_idx_empty():
 
         expected = []
 
-        assert variables == expected
\ No newline at end of file
+        assert variables == expected
+
+def test_get_vars_no_idx_widest_last():
+
+    text_lp = "Max 3x1 + 2x2 | st x1 + x2 <= 4 | x1 + x2 + 4x3 <= 5 | END"
+
+    parser = AplosParser(text=text_lp, delimeter='|')
+
+    if not parser.detect_errors():
+        variables = parser.get_vars()
+
+        expected = ['x1','x2','x3']
+
+        assert variables == expected
+
+def test_get_vars_after_change():
+
+    text_lp = "Max 3x1 + 2x2 | st x1 + x2 <= 4 | END"
+
+    parser = AplosParser(text=text_lp, delimeter='|')
+    assert parser.get_vars() == ['x1','x2']
+
+    parser.lp_lines.insert(2, 'x1+x4<=3')
+    assert parser.get_vars() == ['x1','x2','x3','x4']
+
+    parser.lp_lines = ['Max3x1', 'st', 'x1<=3', 'END']
+    assert parser.get_vars() == ['x1']
+
+def test_get_vars_after_sort():
+
+    text_lp = "Max 3x1 + 2x2 | st x1 + x2 <= 4 | x1 + x4 <= 3 | END"
+
+    parser = AplosParser(text=text_lp, delimeter='|')
+    assert parser.get_vars() == ['x1','x2','x3','x4']
+
+    # Mutators take keyword arguments, like those of a list
+    version = parser.lp_lines.version
+    parser.lp_lines.sort(key=len, reverse=True)
+
+    assert parser.lp_lines == ['Max3x1+2x2', 'stx1+x2<=4', 'x1+x4<=3', 'END'] and \
+           parser.lp_lines.version != version
+
+    del parser.lp_lines[2]
+    assert parser.get_vars() == ['x1','x2']
+
+def test_get_var_index():
+
+    FILE_NAME = 'secondary_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    index = parser.get_var_index()
+
+    expected = {'x1':0, 'x2':1, 'x3':2, 'x4':3, 'x5':4, 'x6':5}
+
+    assert index == expected
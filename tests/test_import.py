@@ -0,0 +1,17 @@
+import subprocess
+import sys
+import os
+
+def test_import_is_lazy():
+
+    # Optional or heavy modules must only be imported when they are used
+    code = ("import sys, Aplos; "
+            "print(' '.join(m for m in ['concurrent.futures', 'multiprocessing', 'tracemalloc', "
+            "'fractions', 'numpy', 'scipy', 'gzip', 'zstandard'] if m in sys.modules))")
+
+    env = dict(os.environ)
+    env.pop('PYTHONTRACEMALLOC', None)
+    env['PYTHONPATH'] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    output = subprocess.check_output([sys.executable, '-c', code], env=env)
+    assert output.decode().strip() == ''
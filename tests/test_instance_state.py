@@ -0,0 +1,54 @@
+from Aplos import AplosParser, exceptions
+from concurrent.futures import ThreadPoolExecutor
+import os
+import pytest
+
+
+def test_instance_state_not_shared():
+
+    with pytest.warns(RuntimeWarning):
+        first = AplosParser(text='')
+        second = AplosParser(text='')
+
+    assert first.lp_lines is not second.lp_lines and \
+           first.error_list is not second.error_list
+
+def test_instance_no_dict():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+
+    with pytest.raises(AttributeError):
+        parser.some_attribute = 1
+
+def test_parsers_in_threads():
+
+    FILE_NAMES = ['main_lp.txt', 'secondary_lp.txt'] * 8
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+
+    def parse(name):
+        parser = AplosParser(filename=os.path.join(CUR_DIR, 'files/'+name))
+        parser.detect_errors()
+        return parser.get_matrices()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(parse, FILE_NAMES))
+
+    assert results == [parse(name) for name in FILE_NAMES]
+
+def test_getters_in_threads():
+
+    FILE_NAME = 'secondary_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: parser.get_dual_matrices(), range(16)))
+
+        assert all(result == results[0] for result in results)
@@ -0,0 +1,80 @@
+from Aplos import AplosParser, exceptions
+import Aplos
+import os
+import pytest
+
+
+def test_iter_constraints_normal():
+
+    FILE_NAME = 'secondary_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+
+    constraints = list(parser.iter_constraints())
+
+    expected = []
+    expected.append({"terms":[(2, 0), (2, 1), (1, 2), (1, 4), (-1, 5)], "relation":'<=', "rhs":9})
+    expected.append({"terms":[(2, 0), (5, 1)], "relation":'<=', "rhs":4})
+
+    assert constraints == expected
+
+def test_iter_constraints_empty():
+
+    with pytest.warns(RuntimeWarning):
+        parser = AplosParser(text='')
+
+    with pytest.raises(exceptions.EmptyLPException):
+        next(parser.iter_constraints())
+
+def test_read_file_stops_at_end(tmpdir):
+
+    test_file = tmpdir.join('lp.txt')
+    test_file.write('Max 3x1 +2x2\ns.t. x1+2x2<=9\n\nEND\n3x1 +2x2\n')
+
+    parser = AplosParser(filename=str(test_file))
+
+    assert parser.lp_lines == ['Max3x1+2x2', 's.t.x1+2x2<=9', 'END']
+
+def test_iter_constraints_not_memoized():
+
+    text = 'max 3x1 + 2x2\ns.t. x1 + 2x2 <= 9\n2x1 + 5x2 <= 4\nEND'
+
+    parser = AplosParser(text=text)
+    list(parser.iter_constraints())
+
+    # Nothing was kept, so every line is tokenized again when checked
+    parser.stats = Aplos.ParserStats()
+    parser.detect_errors()
+
+    assert parser.stats.as_dict()['tokenize']['calls'] == 3
+
+def test_iter_file_constraints(tmpdir):
+
+    FILE_NAME = 'secondary_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    constraints = AplosParser.iter_file_constraints(test_file)
+
+    assert list(constraints) == list(AplosParser(filename=test_file).iter_constraints())
+
+    test_file = tmpdir.join('symbols_lp.txt')
+    test_file.write('max 3y + 2flow_1\ns.t. flow_1 + z <= 9\nEND\n')
+
+    constraints = AplosParser.iter_file_constraints(str(test_file), symbols=True)
+    parser = AplosParser(filename=str(test_file), symbols=True)
+
+    assert list(constraints) == list(parser.iter_constraints()) == \
+           [{"terms":[(1, 1), (1, 2)], "relation":'<=', "rhs":9}]
+
+def test_read_file_end_first_line(tmpdir):
+
+    # Like detect_errors(), reading doesn't stop at an 'END' in the first line
+    test_file = tmpdir.join('lp.txt')
+    test_file.write('END\ns.t. x1<=9\nEND\n3x1\n')
+
+    parser = AplosParser(filename=str(test_file))
+
+    assert parser.lp_lines == ['END', 's.t.x1<=9', 'END']
@@ -0,0 +1,84 @@
+from Aplos import AplosParser, exceptions
+import os
+import pytest
+
+
+def test_cache_hits():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        first = parser.get_dual_matrices()
+        info = parser.cache_info()
+
+        second = parser.get_dual_matrices()
+
+        # The second call is served entirely from the cache
+        assert first == second and \
+               parser.cache_info()['misses'] == info['misses'] and \
+               parser.cache_info()['hits'] == info['hits'] + 6
+
+def test_cache_primal_a_computed_once():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        parser.get_matrices()
+        parser.get_dual_matrices()
+
+        # 5 primal + 6 dual matrices
+        assert parser.cache_info()['misses'] == 11
+
+def test_cache_invalidation():
+
+    text = "Max 3x1 + 2x2 | st x1 + 2x2 <= 9 | 2x1 + 5x2 <= 4 | END"
+
+    parser = AplosParser(text=text, delimeter='|')
+    if not parser.detect_errors():
+        assert parser.get_matrix('b') == [9, 4]
+
+        parser.lp_lines[1] = 'x1+2x2+x3<=7'
+
+        assert parser.get_matrix('b') == [7, 4] and \
+               parser.get_matrix('A') == [[1, 2, 1], [2, 5, 0]]
+
+def test_cache_clear():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        parser.get_matrices()
+        parser.cache_clear()
+
+        assert parser.cache_info() == {'hits':0, 'misses':0, 'size':0}
+
+def test_cache_returns_copies():
+
+    text = "Max 3x1 + 2x2 | st x1 + 2x2 <= 9 | 2x1 + 5x2 <= 4 | END"
+
+    parser = AplosParser(text=text, delimeter='|')
+    if not parser.detect_errors():
+        A = parser.get_matrix('a')
+        A[0][0] = 42
+        parser.get_matrix('b').append(7)
+        parser.get_matrix('a', sparse=True)['shape'] = (1, 1)
+        parser.get_dual_matrix('a')[0][0] = 42
+
+        # Modifying the returned matrices leaves the cache intact
+        assert parser.get_matrices() == {'A':[[1, 2], [2, 5]], 'b':[9, 4], 'c':[3, 2],
+                                         'Eqin':[-1, -1], 'MinMax':[1]} and \
+               list(parser.get_matrix('a', sparse=True)['data']) == [1, 2, 2, 5] and \
+               parser.get_dual_matrix('a') == [[1, 2], [2, 5]]
+
+        # The arrays of sparse matrices are shared, but read-only
+        with pytest.raises(TypeError):
+            parser.get_matrix('a', sparse=True)['data'][0] = 42
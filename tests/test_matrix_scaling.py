@@ -0,0 +1,49 @@
+from Aplos import AplosParser
+import timeit
+
+
+def build_lp(m, n=20):
+    '''Returns the text of an LP with `m` constraints over `n` variables'''
+
+    terms = ' + '.join('{0}x{1}'.format(j % 7 + 1, j + 1) for j in range(n))
+    lines = ['Max ' + terms, 's.t. ' + terms + ' <= 10']
+    lines += [terms + ' <= {0}'.format(i) for i in range(m - 1)]
+    lines.append('END')
+
+    return '\n'.join(lines)
+
+def time_matrix_a(m):
+    '''Returns the best time of building A for an LP with `m` constraints'''
+
+    parser = AplosParser(text=build_lp(m))
+    assert parser.detect_errors() == []
+
+    return min(timeit.repeat(lambda: parser.get_matrix('A'), number=1, repeat=5))
+
+def test_matrix_a_scales_linearly():
+
+    small = time_matrix_a(250)
+    large = time_matrix_a(2000)
+
+    # 8 times the constraints. A linear build takes ~8 times longer,
+    # a quadratic one ~64 times. Leave plenty of room for timer noise.
+    assert large / small < 24
+
+def time_wide_row(n):
+    '''Returns the best time of tokenizing a row of `n` terms without factors'''
+
+    row = ' + '.join('x{0}'.format(j + 1) for j in range(n))
+
+    def parse():
+        parser = AplosParser(text='max ' + row + '\ns.t. ' + row + ' <= 1\nEND')
+        parser.get_vars(0)
+
+    return min(timeit.repeat(parse, number=1, repeat=5))
+
+def test_wide_row_scales_linearly():
+
+    small = time_wide_row(500)
+    large = time_wide_row(4000)
+
+    # Rewriting the line for every hidden factor is quadratic
+    assert large / small < 24
@@ -0,0 +1,119 @@
+from Aplos import AplosParser, LPModel, exceptions
+import os
+import pickle
+import pytest
+
+
+def test_to_model():
+
+    FILE_NAME = 'secondary_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        model = parser.to_model()
+        matrices = parser.get_matrices()
+
+        assert model.dense_A() == matrices['A'] and \
+               list(model.b) == matrices['b'] and \
+               list(model.c) == matrices['c'] and \
+               list(model.Eqin) == matrices['Eqin'] and \
+               [model.MinMax] == matrices['MinMax'] and \
+               list(model.VarConstr) == [1]*6 and \
+               model.var_names == ('x1','x2','x3','x4','x5','x6')
+
+def test_to_model_errors():
+
+    FILE_NAME = 'error_lp_1.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+
+    with pytest.raises(exceptions.LPErrorException):
+        model = parser.to_model()
+
+def test_model_immutable():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        model = parser.to_model()
+
+        with pytest.raises(AttributeError):
+            model.MinMax = -1
+
+        with pytest.raises(AttributeError):
+            model.other = 1
+
+        # The data can't be modified either
+        with pytest.raises(TypeError):
+            model.b[0] = 99
+        with pytest.raises(TypeError):
+            model.A.data[0] = 7
+
+        assert model == parser.to_model() and \
+               hash(model) == hash(parser.to_model()) and \
+               len({model, parser.to_model()}) == 1
+
+def test_model_pickle():
+
+    FILE_NAME = 'secondary_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        model = parser.to_model()
+
+        copy = pickle.loads(pickle.dumps(model))
+
+        assert copy == model and hash(copy) == hash(model) and \
+               copy.b.readonly
+
+def test_model_dual():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        dual = parser.to_model().dual()
+        matrices = parser.get_dual_matrices()
+
+        assert dual.dense_A() == matrices['A'] and \
+               list(dual.b) == matrices['b'] and \
+               list(dual.c) == matrices['c'] and \
+               list(dual.Eqin) == matrices['Eqin'] and \
+               [dual.MinMax] == matrices['MinMax'] and \
+               list(dual.VarConstr) == matrices['VarConstr'] and \
+               dual.var_names == ('w1', 'w2')
+
+def test_model_dual_rules():
+
+    text = '''min 3x1 - 5x2 + x4
+              st x2 + x3 = 2
+              2x1 + 3x2 + 5x4 >= 5
+              x1 - 5x2 + 2x3 - 4x4 <= 10
+              END'''
+
+    parser = AplosParser(text=text)
+    if not parser.detect_errors():
+        model = parser.to_model()
+        dual = model.dual()
+
+        assert dual.A.shape == (4, 3) and \
+               dual.dense_A() == [list(col) for col in zip(*model.dense_A())] and \
+               dual.MinMax == 1 and \
+               list(dual.Eqin) == [-1, -1, -1, -1] and \
+               list(dual.VarConstr) == [0, 1, -1]
+
+        # The dual of the dual is the primal
+        assert dual.dual().dense_A() == model.dense_A() and \
+               list(dual.dual().Eqin) == list(model.Eqin) and \
+               dual.dual().MinMax == model.MinMax
@@ -0,0 +1,57 @@
+from Aplos import AplosParser, exceptions
+import os
+import pytest
+
+
+def test_get_matrices_numpy():
+
+    np = pytest.importorskip('numpy')
+
+    FILE_NAME = 'secondary_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        matrices = parser.get_matrices(backend='numpy')
+        expected = parser.get_matrices()
+
+        for key in expected:
+            assert isinstance(matrices[key], np.ndarray)
+            assert matrices[key].dtype == np.int64
+            assert matrices[key].tolist() == expected[key]
+
+def test_get_dual_matrices_numpy():
+
+    np = pytest.importorskip('numpy')
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        matrices = parser.get_dual_matrices(backend='numpy')
+        expected = parser.get_dual_matrices()
+
+        for key in expected:
+            assert matrices[key].tolist() == expected[key]
+
+        # The dual A is a read-only view on the primal A
+        assert np.shares_memory(matrices['A'], parser.get_matrix('A', backend='numpy')) and \
+               not matrices['A'].flags.writeable
+
+        with pytest.raises(ValueError):
+            matrices['A'][0, 0] = 42
+
+def test_get_matrix_unknown_backend():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+
+        with pytest.raises(ValueError):
+            A = parser.get_matrix('A', backend='pandas')
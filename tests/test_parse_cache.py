@@ -0,0 +1,150 @@
+from Aplos import AplosParser, ParseCache
+import Aplos
+import os
+import shutil
+import time
+import pytest
+
+
+def copy_test_file(tmpdir, name):
+
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    path = str(tmpdir.join(name))
+    shutil.copy(os.path.join(CUR_DIR, 'files/'+name), path)
+
+    return path
+
+@pytest.mark.parametrize('dual', [False, True])
+def test_parse_cache_hit(tmpdir, dual):
+
+    cache = ParseCache(str(tmpdir.join('cache')))
+    path = copy_test_file(tmpdir, 'secondary_lp.txt')
+
+    first = Aplos.parse_file(path, dual=dual, cache=cache)
+    assert cache.get(cache.key(path, dual), dual) is not None
+
+    # Hits are identical to parsing the file
+    second = Aplos.parse_file(path, dual=dual, cache=cache)
+    assert first == second == Aplos.parse_file(path, dual=dual)
+
+@pytest.mark.parametrize('dual', [False, True])
+def test_parse_cache_number_types(tmpdir, dual):
+
+    cache = ParseCache(str(tmpdir.join('cache')))
+    path = str(tmpdir.join('mixed_lp.txt'))
+
+    # Ints and floats, including integral ones like '2.0'
+    with open(path, 'w') as lp_file:
+        lp_file.write('max 3x1 + 2.5x2\ns.t. x1 + 2.0x2 <= 4\n0.5x1 + x2 <= 1\nEND')
+
+    expected = Aplos.parse_file(path, dual=dual)
+    Aplos.parse_file(path, dual=dual, cache=cache)
+    cached = Aplos.parse_file(path, dual=dual, cache=cache)
+
+    def types(matrices):
+        return {name:[type(el) for el in (sum(value, []) if name == 'A' else value)]
+                for name, value in matrices.items()}
+
+    assert cached == expected and \
+           types(cached['matrices']) == types(expected['matrices'])
+
+def test_parse_cache_errors(tmpdir):
+
+    cache = ParseCache(str(tmpdir.join('cache')))
+    path = copy_test_file(tmpdir, 'error_lp_1.txt')
+
+    expected = Aplos.parse_file(path)
+    Aplos.parse_file(path, cache=cache)
+
+    assert cache.get(cache.key(path)) == {'errors':expected['errors'], 'matrices':None}
+    assert Aplos.parse_file(path, cache=cache) == expected
+
+def test_parse_cache_invalidation(tmpdir):
+
+    cache = ParseCache(str(tmpdir.join('cache')))
+    path = copy_test_file(tmpdir, 'main_lp.txt')
+
+    Aplos.parse_file(path, cache=cache)
+    old_key = cache.key(path)
+
+    with open(path, 'w') as lp_file:
+        lp_file.write('max 3x1 + 2x2\ns.t. x1 + 2x2 <= 7\nEND')
+
+    assert cache.key(path) != old_key and cache.get(cache.key(path)) is None
+    assert Aplos.parse_file(path, cache=cache)['matrices']['b'] == [7]
+
+    # Primal and dual results are kept apart
+    assert cache.key(path) != cache.key(path, dual=True)
+
+def test_parse_cache_exceptions(tmpdir):
+
+    cache = ParseCache(str(tmpdir.join('cache')))
+
+    result = Aplos.parse_file(str(tmpdir.join('NOT_EXISTS.txt')), cache=cache)
+
+    assert isinstance(result['exception'], IOError) and cache.size() == 0
+
+def test_parse_cache_eviction(tmpdir):
+
+    cache = ParseCache(str(tmpdir.join('cache')))
+    paths = [copy_test_file(tmpdir, 'main_lp.txt'), str(tmpdir.join('changed_lp.txt'))]
+
+    # Same LP, different contents, so an entry of the same size
+    with open(paths[0]) as lp_file, open(paths[1], 'w') as changed_file:
+        changed_file.write(lp_file.read() + '\n')
+
+    Aplos.parse_file(paths[0], cache=cache)
+    entry_size = cache.size()
+
+    # Make the first entry the least recently used one
+    past = time.time() - 100
+    for name in os.listdir(cache.directory):
+        os.utime(os.path.join(cache.directory, name), (past, past))
+
+    # Room for one and a half entries
+    cache.max_size = entry_size * 3 // 2
+    Aplos.parse_file(paths[1], cache=cache)
+
+    assert cache.get(cache.key(paths[0])) is None and \
+           cache.get(cache.key(paths[1])) is not None and \
+           cache.size() <= entry_size
+
+    cache.clear()
+    assert cache.size() == 0
+
+def test_parse_cache_scans(tmpdir, monkeypatch):
+
+    cache = ParseCache(str(tmpdir.join('cache')))
+    paths = [str(tmpdir.join('lp_{0}.txt'.format(i))) for i in range(5)]
+    for i, path in enumerate(paths):
+        with open(path, 'w') as lp_file:
+            lp_file.write('max 3x1\ns.t. x1 <= {0}\nEND'.format(i))
+
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path: scans.append(path) or scandir(path))
+
+    for path in paths:
+        Aplos.parse_file(path, cache=cache)
+
+    # Only the first put() scans the directory, the size is kept up to date
+    assert len(scans) == 1 and \
+           cache.size() == sum(os.path.getsize(os.path.join(cache.directory, name))
+                               for name in os.listdir(cache.directory))
+
+def test_parse_cache_directory(tmpdir, monkeypatch):
+
+    monkeypatch.setenv('APLOS_CACHE_DIR', str(tmpdir.join('env_cache')))
+
+    assert ParseCache().directory == str(tmpdir.join('env_cache'))
+
+def test_parse_many_cache(tmpdir):
+
+    cache = ParseCache(str(tmpdir.join('cache')))
+    paths = [copy_test_file(tmpdir, name) for name in ['main_lp.txt', 'secondary_lp.txt']]
+
+    first = dict(Aplos.parse_many(paths, workers=2, cache=cache))
+    second = dict(Aplos.parse_many(paths, workers=2, cache=cache))
+
+    assert first == second and \
+           all(cache.get(cache.key(path)) for path in paths)
@@ -0,0 +1,48 @@
+from Aplos import AplosParser, exceptions
+import Aplos
+import os
+import pytest
+
+
+def get_test_files():
+
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    FILE_NAMES = ['main_lp.txt', 'secondary_lp.txt', 'error_lp_1.txt', 'empty.txt', 'NOT_EXISTS.txt']
+
+    return [os.path.join(CUR_DIR, 'files/'+name) for name in FILE_NAMES]
+
+def test_parse_file_normal():
+
+    result = Aplos.parse_file(get_test_files()[0])
+
+    expected = {'A':[[1,2],[2,5]], 'b':[9,4], 'c':[3,2], 'Eqin':[-1,-1], 'MinMax':[1]}
+
+    assert result == {'errors':[], 'matrices':expected, 'exception':None}
+
+def test_parse_file_errors():
+
+    result = Aplos.parse_file(get_test_files()[2])
+
+    assert result['errors'] and result['matrices'] is None
+
+def test_parse_file_exceptions():
+
+    empty, not_exists = get_test_files()[3:]
+
+    assert isinstance(Aplos.parse_file(empty)['exception'], exceptions.EmptyLPException)
+    assert isinstance(Aplos.parse_file(not_exists)['exception'], IOError)
+
+@pytest.mark.parametrize('workers,chunksize', [(1, 1), (2, 1), (2, 3)])
+def test_parse_many(workers, chunksize):
+
+    paths = get_test_files()
+
+    results = dict(Aplos.parse_many(paths, workers=workers, chunksize=chunksize, dual=True))
+
+    assert sorted(results) == sorted(paths)
+    for path in paths:
+        expected = Aplos.parse_file(path, dual=True)
+
+        assert results[path]['errors'] == expected['errors'] and \
+               results[path]['matrices'] == expected['matrices'] and \
+               type(results[path]['exception']) == type(expected['exception'])
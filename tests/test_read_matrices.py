@@ -62,4 +62,31 @@ def test_open_file_dual():
 
     ex = {'A':ex_A, 'b':ex_b, 'c':ex_c, "Eqin":ex_Eqin, 'MinMax':ex_minmax, 'VarConstr':ex_varconstr}
 
-    assert ex == matrices
\ No newline at end of file
+    assert ex == matrices
+
+def test_open_file_empty():
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+    output_file = os.path.join(CUR_DIR, 'files/empty.txt')
+
+    parser = AplosParser(filename=test_file)
+
+    with pytest.raises(exceptions.LPReadException):
+        matrices = parser.read_matrices_from_file(output_file)
+
+def test_open_file_round_trip(tmpdir):
+
+    text = '''min 3x1 - 5x2 + x4
+              st x2 + x3 = 2
+              2x1 + 3x2 + 5x4 >= 5
+              x1 - 5x2 + 2x3 - 4x4 <= 10
+              END'''
+
+    parser = AplosParser(text=text)
+
+    if not parser.detect_errors():
+        output_file = str(tmpdir.join('output.txt'))
+        parser.write_matrices_to_file(output_file)
+
+        assert parser.read_matrices_from_file(output_file) == parser.get_matrices()
@@ -1,4 +1,6 @@
 from Aplos import AplosParser, exceptions
+import gzip
+import io
 import os
 import pytest
 
@@ -57,4 +59,43 @@ def test_save_to_file_dual():
         parser.write_matrices_to_file(output_file, dual=True)
         
         with open(output_file, 'r') as of, open(expected_file, 'r') as ef:
-            assert of.read() == ef.read()
\ No newline at end of file
+            assert of.read() == ef.read()
+
+def test_save_to_file_objects():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+
+    if not parser.detect_errors():
+        expected_file = os.path.join(CUR_DIR, 'files/matrices_file.txt')
+        with open(expected_file, 'r') as ef:
+            expected = ef.read()
+
+        text_out = io.StringIO()
+        parser.write_matrices_to_file(text_out)
+
+        bytes_out = io.BytesIO()
+        parser.write_matrices_to_file(bytes_out)
+
+        gzip_out = io.BytesIO()
+        with gzip.GzipFile(fileobj=gzip_out, mode='wb') as gz:
+            parser.write_matrices_to_file(gz)
+
+        assert text_out.getvalue() == expected and \
+               bytes_out.getvalue().decode() == expected and \
+               gzip.decompress(gzip_out.getvalue()).decode() == expected
+
+def test_save_to_file_duplicate_rows(tmpdir):
+
+    text = "Max 3x1 + 2x2 | st x1 + 2x2 <= 9 | x1 + 2x2 <= 9 | 2x1 + 5x2 <= 4 | END"
+
+    parser = AplosParser(text=text, delimeter='|')
+
+    if not parser.detect_errors():
+        output_file = str(tmpdir.join('output.txt'))
+        parser.write_matrices_to_file(output_file)
+
+        assert parser.read_matrices_from_file(output_file)['A'] == [[1,2],[1,2],[2,5]]
@@ -0,0 +1,83 @@
+from Aplos import AplosParser, exceptions
+import Aplos
+import os
+import pytest
+
+
+def test_get_matrix_sparse_coo():
+
+    FILE_NAME = 'secondary_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        A = parser.get_matrix('A', sparse=True)
+
+        assert list(A['row']) == [0, 0, 0, 0, 0, 1, 1] and \
+               list(A['col']) == [0, 1, 2, 4, 5, 0, 1] and \
+               list(A['data']) == [2, 2, 1, 1, -1, 2, 5] and \
+               A['shape'] == (2, 6)
+
+def test_get_matrix_sparse_csr():
+
+    FILE_NAME = 'secondary_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        A = parser.get_matrix('A', sparse=True, format='csr')
+        dense = parser.get_matrix('A')
+
+        # Rebuild the dense matrix from the csr arrays
+        rebuilt = [[0]*A['shape'][1] for _ in range(A['shape'][0])]
+        for i in range(A['shape'][0]):
+            for k in range(A['indptr'][i], A['indptr'][i+1]):
+                rebuilt[i][A['indices'][k]] = A['data'][k]
+
+        assert list(A['indptr']) == [0, 5, 7] and rebuilt == dense
+
+def test_get_matrix_sparse_wrong_format():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+
+        with pytest.raises(ValueError):
+            A = parser.get_matrix('A', sparse=True, format='csc')
+
+        with pytest.raises(ValueError):
+            b = parser.get_matrix('b', sparse=True)
+
+def test_get_matrix_sparse_unsorted_vars():
+
+    parser = AplosParser(text='max 3x1 + 2x2\ns.t. x3 + x1 <= 4\nEND')
+    assert parser.detect_errors() == []
+
+    A = parser.get_matrix('A', sparse=True)
+
+    assert list(A['col']) == [0, 2] and A['shape'] == (1, 3)
+
+def test_build_sparse_shape():
+
+    # Columns that don't fit in the shape are rejected
+    with pytest.raises(ValueError):
+        Aplos.sparse.build_sparse([[(1, 0), (1, 2)]], (1, 2))
+
+def test_sparse_to_scipy():
+
+    pytest.importorskip('scipy')
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+    if not parser.detect_errors():
+        A = Aplos.to_scipy(parser.get_matrix('A', sparse=True, format='csr'))
+
+        assert A.toarray().tolist() == [[1,2],[2,5]]
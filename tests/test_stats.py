@@ -0,0 +1,62 @@
+from Aplos import AplosParser, ParserStats, exceptions
+import os
+import pytest
+import tracemalloc
+
+
+def test_stats_disabled():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file)
+
+    assert parser.stats is None
+
+def test_stats_stages():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    parser = AplosParser(filename=test_file, stats=True)
+    if not parser.detect_errors():
+        parser.get_matrices()
+        parser.get_matrices()
+
+        stats = parser.stats.as_dict()
+
+        assert sorted(stats) == ['detect_errors', 'get_matrix', 'get_vars', 'read', 'tokenize']
+        assert stats['read']['calls'] == 1 and stats['tokenize']['calls'] == 3
+        # Cached matrices aren't computed again
+        assert stats['get_matrix']['calls'] == 5
+        assert all(stage['seconds'] >= 0 and stage['bytes'] is None for stage in stats.values())
+
+def test_stats_callback_and_memory():
+
+    FILE_NAME = 'main_lp.txt'
+    CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(CUR_DIR, 'files/'+FILE_NAME)
+
+    calls = []
+    stats = ParserStats(callback=lambda *args: calls.append(args))
+
+    tracemalloc.start()
+    try:
+        parser = AplosParser(filename=test_file, stats=stats)
+    finally:
+        tracemalloc.stop()
+
+    assert parser.stats is stats
+    assert calls == [('read', stats.as_dict()['read']['seconds'], stats.as_dict()['read']['bytes'])]
+    assert stats.as_dict()['read']['bytes'] is not None
+
+def test_stats_env_var(monkeypatch):
+
+    monkeypatch.setenv('APLOS_STATS', '1')
+
+    parser = AplosParser(text='Max 3x1|st x1<=3|END', delimeter='|')
+
+    assert isinstance(parser.stats, ParserStats) and \
+           parser.stats.as_dict()['read']['calls'] == 1
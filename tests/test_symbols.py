@@ -0,0 +1,104 @@
+from Aplos import AplosParser
+import pytest
+
+
+TEXT = "min 3flow_17_42 + 2y - Z | st y + flow_17_42 <= 1e2 | -2.5Z + y >= 3 | stock + y = 4 | END"
+
+def get_parser():
+
+    parser = AplosParser(text=TEXT, delimeter='|', symbols=True)
+    assert parser.detect_errors() == []
+
+    return parser
+
+def test_symbol_table():
+
+    parser = get_parser()
+
+    # Columns are given in order of first appearance
+    assert parser.get_vars() == ['flow_17_42', 'y', 'Z', 'stock'] and \
+           parser.get_var_index() == {'flow_17_42':0, 'y':1, 'Z':2, 'stock':3} and \
+           parser.get_dimensions() == {'m':3, 'n':4}
+
+    assert parser.get_vars(1) == {'existing':['y', 'flow_17_42'], 'extended':['flow_17_42', 'y']}
+
+def test_names_are_interned():
+
+    parser = get_parser()
+
+    objective = parser.get_vars(0)['existing']
+    constraint = parser.get_vars(1)['existing']
+
+    assert objective[0] is constraint[1]
+
+def test_symbol_matrices():
+
+    parser = get_parser()
+
+    assert parser.get_matrices() == {'A':[[1,1,0,0],[0,1,-2.5,0],[0,1,0,1]], 'b':[100.0,3,4],
+                                     'c':[3,2,-1,0], 'Eqin':[-1,1,0], 'MinMax':[-1]}
+
+    assert parser.get_dual_matrix('a') == [[1,0,0],[1,1,1],[0,-2.5,0],[0,0,1]]
+
+def test_sparse_numbering_is_compact():
+
+    # Only the variables used get a column
+    parser = AplosParser(text='max x7 + x1000 | s.t. x1000 <= 1 | END', delimeter='|', symbols=True)
+    assert parser.detect_errors() == []
+
+    assert parser.get_vars() == ['x7', 'x1000'] and \
+           parser.get_matrix('a') == [[0, 1]]
+
+def test_names_like_keywords():
+
+    # The keywords are only taken from the start of the lines
+    parser = AplosParser(text='max maximum + send | s.t. stock - send <= 1 | END', delimeter='|', symbols=True)
+    assert parser.detect_errors() == []
+
+    assert parser.get_vars() == ['maximum', 'send', 'stock'] and \
+           parser.get_matrix('minmax') == [1] and \
+           parser.get_matrix('a') == [[0, -1, 1]]
+
+def test_missing_initializer():
+
+    parser = AplosParser(text='max a + b | a <= 1 | END', delimeter='|', symbols=True)
+
+    with pytest.warns(RuntimeWarning):
+        assert parser.detect_errors() == ["Constraint initializer 's.t' or similar is missing"]
+
+def test_symbol_edits():
+
+    parser = get_parser()
+    parser.get_matrices()
+
+    parser.add_constraint('new_var - stock <= 7')
+    assert parser.get_vars() == ['flow_17_42', 'y', 'Z', 'stock', 'new_var'] and \
+           parser.get_matrix('a')[3] == [0, 0, 0, -1, 1]
+
+    # The first constraint may start like an initializer
+    parser.replace_constraint(0, 'stock + y <= 1')
+    assert parser.get_matrix('a')[0] == [0, 1, 0, 1, 0]
+
+    # Variables that are no longer used lose their column
+    parser.remove_constraint(3)
+    parser.set_objective('max y')
+    assert parser.get_vars() == ['y', 'stock', 'Z'] and \
+           parser.get_dimensions() == {'m':3, 'n':3} and \
+           parser.get_matrices() == {'A':[[1,1,0],[1,0,-2.5],[1,1,0]], 'b':[1,3,4],
+                                     'c':[1,0,0], 'Eqin':[-1,1,0], 'MinMax':[1]}
+
+def test_names_after_numbers():
+
+    # Whitespace is removed, but '3e + 2y' is not 3e+2 (300) times y
+    parser = AplosParser(text='max 3e + 2y | s.t. e - y <= 1 | END', delimeter='|', symbols=True)
+    assert parser.detect_errors() == []
+
+    assert parser.get_vars() == ['e', 'y'] and \
+           parser.get_matrix('c') == [3, 2]
+
+    # Nor is the sign after 'node_2e' part of an exponent
+    parser = AplosParser(text='max 3node_2e + 2y | s.t. node_2e - y <= 4 | END', delimeter='|', symbols=True)
+    assert parser.detect_errors() == []
+
+    assert parser.get_vars() == ['node_2e', 'y'] and \
+           parser.get_matrices() == {'A':[[1, -1]], 'b':[4], 'c':[3, 2], 'Eqin':[-1], 'MinMax':[1]}